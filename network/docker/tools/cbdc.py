@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import csv
+import time
+import argparse
+import traceback
+
+from nodelib import Contract, read_addrs, is_batch_read, add_read_args, add_node_args, daemon_call
+
+CONTRACT_NAME = "CBDC"
+PROG = sys.argv[0]
+
+# read subcommands that take many addresses and the contract functions they call
+READS = {
+    "balance": "balanceOf",
+    "supply": "supplyOf"
+}
+
+# batch defaults: transactions in flight, gas per transaction and seconds to wait for a receipt
+BATCH_WINDOW = 256
+BATCH_GAS = 1000000
+BATCH_TIMEOUT = 120
+BATCH_FIELDS = ["op", "addr", "amount", "merchcode"]
+
+class CBDC(Contract):
+    """Represents an API to the governing contracts."""
+    READ_ONLY = ["balance", "supply"]
+
+    def caller(self, func_name, *args):
+        """Handles calls to contract."""
+        if func_name == "balance":
+            addr = args[0]
+            try:
+                return self.instance.functions.balanceOf(addr).call()
+            except:
+                return "Something went wrong."
+        elif func_name == "supply":
+            addr = args[0]
+            try:
+                return self.instance.functions.supplyOf(addr).call()
+            except:
+                return "Something went wrong."
+        elif func_name == "mint":
+            addr, amount = args
+            tx_hash = self.send(self.instance.functions.mint(addr, amount), 1000000)
+            tx_receipt = self.w3.eth.waitForTransactionReceipt(tx_hash)
+            return self.instance.events.Minting().processReceipt(tx_receipt)
+        elif func_name == "alloc":
+            addr, amount, merchcode = args
+            tx_hash = self.send(self.instance.functions.allocate(addr, amount, merchcode), 1000000)
+            tx_receipt = self.w3.eth.waitForTransactionReceipt(tx_hash)
+            return self.instance.events.Allocation().processReceipt(tx_receipt)
+        else:
+            print(f"Unkown function name '{func_name}'.")
+            sys.exit(1)
+
+    def transaction(self, op):
+        """Returns the contract function of a batch operation."""
+        from web3 import Web3
+
+        addr = Web3.toChecksumAddress(op["addr"])
+        amount = int(op["amount"])
+        if op["op"] == "mint":
+            return self.instance.functions.mint(addr, amount)
+        elif op["op"] == "alloc":
+            return self.instance.functions.allocate(addr, amount, int(op["merchcode"]))
+        else:
+            raise ValueError(f"Unknown operation '{op['op']}'.")
+
+    def batch(self, ops, results, window=BATCH_WINDOW, timeout=BATCH_TIMEOUT):
+        """Sends all operations of a batch with sequential nonces, keeping up to 'window' transactions in flight, and writes one result per operation to 'results'. Returns the count of results by status."""
+        counts = {"ok": 0, "failed": 0, "error": 0, "timeout": 0}
+        pending = {}
+        block = self.w3.eth.blockNumber
+
+        def write(line, status, **fields):
+            counts[status] += 1
+            results.write(json.dumps({"line": line, "status": status, **fields}) + "\n")
+
+        def collect(wait_for):
+            """Collects the receipts of pending transactions from new blocks until at most 'wait_for' are pending."""
+            nonlocal block
+            while len(pending) > wait_for:
+                head = self.w3.eth.blockNumber
+                if head == block:
+                    time.sleep(0.2)
+                else:
+                    # only the transactions of new blocks are looked up, not every pending one
+                    for number in range(block + 1, head + 1):
+                        for tx_hash in self.w3.eth.getBlock(number)["transactions"]:
+                            if tx_hash in pending:
+                                line, _ = pending.pop(tx_hash)
+                                receipt = self.w3.eth.getTransactionReceipt(tx_hash)
+                                status = "ok" if receipt["status"] == 1 else "failed"
+                                write(line, status, tx=tx_hash.hex(), block=number, gas=receipt["gasUsed"])
+                    block = head
+
+                now = time.monotonic()
+                for tx_hash, (line, sent) in list(pending.items()):
+                    if now - sent > timeout:
+                        del pending[tx_hash]
+                        write(line, "timeout", tx=tx_hash.hex())
+                        self.nonces.sync()
+            results.flush()
+
+        for line, op in ops:
+            try:
+                if isinstance(op, Exception):
+                    raise op
+                tx_hash = self.send(self.transaction(op), BATCH_GAS)
+            except Exception as err:
+                # a rejected transaction does not use up its nonce
+                write(line, "error", error=str(err))
+                continue
+            pending[tx_hash] = (line, time.monotonic())
+            if len(pending) >= window:
+                collect(window - 1)
+
+        collect(0)
+        return counts
+
+def read_ops(path):
+    """Yields the line number and operation of each line of a batch file. CSV files have the columns 'op,addr,amount[,merchcode]', an optional header included, every other file holds one JSON object per line. Lines that cannot be parsed yield the error instead."""
+    with open(path, newline="") as f:
+        if path.endswith(".csv"):
+            for line, row in enumerate(csv.reader(f), start=1):
+                if row == [] or (line == 1 and row[0] == "op"):
+                    continue
+                yield line, dict(zip(BATCH_FIELDS, (field.strip() for field in row)))
+        else:
+            for line, row in enumerate(f, start=1):
+                if row.strip() == "":
+                    continue
+                try:
+                    yield line, json.loads(row)
+                except ValueError as err:
+                    yield line, err
+
+def read_many(args):
+    """Reads the subcommand's contract function for many addresses and writes them as CSV, like the reconciliation of many accounts needs."""
+    contract = CBDC(args.info, args.node_info, args.ipc)
+    addrs = read_addrs(args.f) if args.f is not None else args.a
+    block = contract.w3.eth.blockNumber if args.pin else args.b
+
+    out = open(args.o, "w", newline="") if args.o is not None else sys.stdout
+    try:
+        contract.read_many(READS[args.cmd], addrs, out, block=block, chunk_size=max(args.chunk, 1), args=())
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+def call_args(args):
+    """Returns the contract function name and its arguments of a subcommand."""
+    if args.cmd in ["balance", "supply"]:
+        return args.cmd, (args.a,)
+    elif args.cmd == "mint":
+        return "mint", (args.a, args.n)
+    elif args.cmd == "alloc":
+        return "alloc", (args.a, args.n, args.m)
+
+    return None
+
+def arg_parser():
+    """Defines parser for command line input."""
+    parser = argparse.ArgumentParser(prog=PROG, description="Command line wrapper to interact with CBDC contract.")
+    add_node_args(parser, CONTRACT_NAME)
+    subparsers = parser.add_subparsers(dest="cmd")
+
+    # balance subcmd
+    balance_parser = subparsers.add_parser("balance", help="Shows balance of address, or of many addresses as CSV.")
+    add_read_args(balance_parser, "Balance of these addresses.")
+
+    # supply subcmd
+    supply_parser = subparsers.add_parser("supply", help="Shows supply of banking node address, or of many addresses as CSV.")
+    add_read_args(supply_parser, "Supply of these addresses.")
+
+    # mint subcmd
+    mint_parser = subparsers.add_parser("mint", help="Mints a given amount of CBDC to given banking node address. Only available to governor nodes.")
+    mint_parser.add_argument("-a", required=True, type=str, help="Address of banker node that will receive the minted CBDC.", metavar="<addr>")
+    mint_parser.add_argument("-n", required=True, type=int, help="Amount to be minted.", metavar="<amount>")
+
+    # alloc subcmd
+    alloc_parser = subparsers.add_parser("alloc", help="Allocates CBDC into given address. Only available to banker nodes.")
+    alloc_parser.add_argument("-a", required=True, type=str, help="Address to be allocated to.", metavar="<addr>")
+    alloc_parser.add_argument("-n", required=True, type=int, help="Amount to be allocated.", metavar="<amount>")
+    alloc_parser.add_argument("-m", required=True, type=int, help="Merchant code for address.", metavar="<merchant-code>")
+
+    # batch subcmd
+    batch_parser = subparsers.add_parser("batch", help="Sends all 'mint' or 'alloc' operations of a CSV or JSONL file and writes one result per line.")
+    batch_parser.add_argument("-f", required=True, type=str, help="File of operations, '.csv' with columns 'op,addr,amount[,merchcode]' or JSONL with these keys.", metavar="<file>")
+    batch_parser.add_argument("-o", type=str, help="Result file, defaults to '<file>.results.jsonl'.", metavar="<file>")
+    batch_parser.add_argument("-w", type=int, default=BATCH_WINDOW, help=f"Transactions in flight at once, defaults to {BATCH_WINDOW}.", metavar="<window>")
+    batch_parser.add_argument("-t", type=int, default=BATCH_TIMEOUT, help=f"Seconds to wait for a transaction's receipt, defaults to {BATCH_TIMEOUT}.", metavar="<timeout>")
+
+    return parser
+
+def main():
+    args = arg_parser().parse_args()
+    if args.cmd in READS:
+        if is_batch_read(args):
+            read_many(args)
+            return
+        args.a = args.a[0]
+
+    call = call_args(args)
+    if call is not None:
+        # a running node daemon answers without loading web3 or asking for the password
+        result = daemon_call(CONTRACT_NAME, args, *call)
+        if result is not None:
+            print(">", result)
+            return
+
+    from web3 import Web3
+    if "a" in vars(args).keys():
+        try:
+            args.a = Web3.toChecksumAddress(args.a)
+        except:
+            print("Invalid address format")
+            sys.exit(1)
+
+    contract = CBDC(args.info, args.node_info, args.ipc)
+
+    if args.local_sign and call is not None and call[0] not in contract.READ_ONLY:
+        contract.load_key(args.keystore)
+
+    # check which subcmd was used and act accordingly
+    if args.cmd == "balance":
+        print(">", contract.call("balance", args.a))
+    elif args.cmd == "supply":
+        print(">", contract.call("supply", args.a))
+    elif args.cmd == "mint":
+        print(">", contract.call("mint", args.a, args.n))
+    elif args.cmd == "alloc":
+        print(">", contract.call("alloc", args.a, args.n, args.m))
+    elif args.cmd == "batch":
+        if not os.path.isfile(args.f):
+            print(f"Could not read batch file '{args.f}'.")
+            sys.exit(1)
+        # the key is decrypted or the account unlocked once for the whole batch, an unlocked account is locked again afterwards
+        if args.local_sign:
+            contract.load_key(args.keystore)
+        else:
+            contract.unlock_acc(duration=0)
+        try:
+            with open(args.o or f"{args.f}.results.jsonl", "w") as results:
+                counts = contract.batch(read_ops(args.f), results, window=max(args.w, 1), timeout=args.t)
+        finally:
+            if contract.signer is None:
+                contract.w3.geth.personal.lockAccount(contract.addr)
+        print(">", ", ".join(f"{count} {status}" for status, count in counts.items()))
+
+if __name__ == "__main__":
+    main()
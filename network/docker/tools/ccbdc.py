@@ -1,86 +1,22 @@
 #!/usr/bin/env python3
 
-import os
 import sys
-import json
-from getpass import getpass
 import argparse
 import traceback
 
-import web3
-from web3 import Web3
+from nodelib import Contract, read_addrs, is_batch_read, add_read_args, add_node_args, daemon_call
 
 CONTRACT_NAME = "CCBDC"
-CONTRACT_INFO_FILE = f"{CONTRACT_NAME}-contract.info"
-NODE_INFO_FILE= "info.json"
-RPC_IPC = os.path.join("data", "geth.ipc")
 PROG = sys.argv[0]
 
-class Contract(object):
-    """Represents a contract wrapper to easily interact."""
-    def __init__(self, info_file, node_info, ipc):
-        self.addr, self.abi = self.read_contract_info(info_file)
-        self.w3 = self.connect(ipc)
-        self.instance = self.w3.eth.contract(self.addr, abi=self.abi)
-
-        # account related
-        self.addr =  self.get_main_addr(node_info)
-        self.w3.eth.defaultAccount = self.addr
-
-    def connect(self, ipc):
-        try:
-            w3 = Web3(Web3.IPCProvider(ipc))
-            w3.middleware_onion.inject(web3.middleware.geth_poa_middleware, layer=0)
-            if not w3.isConnected():
-                raise Exception
-        except:
-            print(f"Could not connect to IPC '{ipc}'")
-            sys.exit(1)
-
-        return w3
-
-    def get_main_addr(self, node_info):
-        """Gets account address"""
-        try:
-            with open(node_info) as f:
-                data = json.load(f)
-        except:
-            print("Could not read node's info file 'info.json'.")
-            sys.exit(1)
-
-        return data["acc_addrs"]["main"]
-
-    def read_contract_info(self, info_file):
-        """Retrieves addr and ABI from config file."""
-        try:
-            with open(info_file) as f:
-                contract_dict = json.load(f)
-        except:
-            print(f"Could not read contract's info file '{info_file}.'")
-            sys.exit(1)
-
-        return contract_dict["addr"], contract_dict["get_abi"]
-
-    def unlock_acc(self):
-        """Unlocks given main account."""
-        passphrase = getpass()
-        try:
-            self.w3.geth.personal.unlockAccount(self.addr, passphrase)
-            print("Correct.\n")
-        except:
-            print(f"\nCould not unlock node's main account '{self.addr}' with given password.")
-            sys.exit(1)
-
-    def call(self, func_name, *args):
-        """Calls the contract functions."""
-        self.unlock_acc()
-        return self.caller(func_name, *args)
-
-    def caller(self, func_name, *args):
-        raise NotImplementedError
+# read subcommands that take many addresses and the contract functions they call
+READS = {
+    "balance": "balanceOf"
+}
 
 class CCBDC(Contract):
     """Represents an API to the governing contracts."""
+    READ_ONLY = ["balance", "show"]
 
     def caller(self, func_name, *args):
         """Handles calls to contract."""
@@ -99,30 +35,54 @@ class CCBDC(Contract):
                 return "Something went wrong."
         elif func_name == "create":
             color, shades, supply, deadline = args
-            tx_hash = self.instance.functions.createNewCoin(color, shades, supply, deadline).transact({"gas": 10000000})
+            tx_hash = self.send(self.instance.functions.createNewCoin(color, shades, supply, deadline), 10000000)
             tx_receipt = self.w3.eth.waitForTransactionReceipt(tx_hash)
             return self.instance.events.CoinCreation().processReceipt(tx_receipt)
         elif func_name == "approve":
             req_id = args[0]
-            tx_hash = self.instance.functions.approveMintingRequest(req_id).transact({"gas": 10000000})
+            tx_hash = self.send(self.instance.functions.approveMintingRequest(req_id), 10000000)
             tx_receipt = self.w3.eth.waitForTransactionReceipt(tx_hash)
             return self.instance.events.Approval().processReceipt(tx_receipt)
         else:
             print(f"Unkown function name '{func_name}'.")
             sys.exit(1)
 
+def read_many(args):
+    """Reads the subcommand's contract function for many addresses and writes them as CSV, like the reconciliation of many accounts needs."""
+    contract = CCBDC(args.info, args.node_info, args.ipc)
+    addrs = read_addrs(args.f) if args.f is not None else args.a
+    block = contract.w3.eth.blockNumber if args.pin else args.b
+
+    out = open(args.o, "w", newline="") if args.o is not None else sys.stdout
+    try:
+        contract.read_many(READS[args.cmd], addrs, out, block=block, chunk_size=max(args.chunk, 1), args=(args.c,))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+def call_args(args):
+    """Returns the contract function name and its arguments of a subcommand."""
+    if args.cmd == "balance":
+        return "balance", (args.c, args.a)
+    elif args.cmd == "create":
+        return "create", (args.C, args.S, args.s, args.d)
+    elif args.cmd == "approve":
+        return "approve", (args.r,)
+    elif args.cmd == "show":
+        return "show", (args.c,)
+
+    return None
+
 def arg_parser():
     """Defines parser for command line input."""
     parser = argparse.ArgumentParser(prog=PROG, description="Command line wrapper to interact with CCBDC contract.")
-    parser.add_argument("--ipc", help="Path to 'geth.ipc'.", default=RPC_IPC, metavar="path/to/ipc", type=str)
-    parser.add_argument("--info", help=f"Path to '{CONTRACT_NAME}-contract.info'.", default=CONTRACT_INFO_FILE, metavar=f"/path/to/{CONTRACT_NAME}.info", type=str)
-    parser.add_argument("--node-info", help=f"Path to node's 'info.json'.", default=NODE_INFO_FILE, metavar="/path/to/info.json", type=str)
+    add_node_args(parser, CONTRACT_NAME)
     subparsers = parser.add_subparsers(dest="cmd")
 
     # balance subcmd
-    balance_parser = subparsers.add_parser("balance", help="Shows the address' balance of a given colored coin.")
+    balance_parser = subparsers.add_parser("balance", help="Shows the address' balance of a given colored coin, or of many addresses as CSV.")
     balance_parser.add_argument("-c", required=True, type=int, help="Of which colored coin.", metavar="<coin-id>")
-    balance_parser.add_argument("-a", required=True, type=str, help="Balance of this address.", metavar="<addr>")
+    add_read_args(balance_parser, "Balance of these addresses.")
 
     # approve subcmd
     approve_parser = subparsers.add_parser("approve", help="Approves a request.")
@@ -143,6 +103,21 @@ def arg_parser():
 
 def main():
     args = arg_parser().parse_args()
+    if args.cmd in READS:
+        if is_batch_read(args):
+            read_many(args)
+            return
+        args.a = args.a[0]
+
+    call = call_args(args)
+    if call is not None:
+        # a running node daemon answers without loading web3 or asking for the password
+        result = daemon_call(CONTRACT_NAME, args, *call)
+        if result is not None:
+            print(">", result)
+            return
+
+    from web3 import Web3
     if "a" in vars(args).keys():
         try:
             args.a = Web3.toChecksumAddress(args.a)
@@ -152,6 +127,9 @@ def main():
 
     contract = CCBDC(args.info, args.node_info, args.ipc)
 
+    if args.local_sign and call is not None and call[0] not in contract.READ_ONLY:
+        contract.load_key(args.keystore)
+
     # check which subcmd was used and act accordingly
     if args.cmd == "balance":
         print(">", contract.call("balance", args.c, args.a))
@@ -1,86 +1,17 @@
 #!/usr/bin/env python3
 
-import os
 import sys
-import json
-from getpass import getpass
 import argparse
 import traceback
 
-import web3
-from web3 import Web3
+from nodelib import Contract, add_node_args, daemon_call
 
 CONTRACT_NAME = "Governing"
-CONTRACT_INFO_FILE = f"{CONTRACT_NAME}-contract.info"
-NODE_INFO_FILE= "info.json"
-RPC_IPC = os.path.join("data", "geth.ipc")
 PROG = sys.argv[0]
 
-class Contract(object):
-    """Represents a contract wrapper to easily interact."""
-    def __init__(self, info_file, node_info, ipc):
-        self.addr, self.abi = self.read_contract_info(info_file)
-        self.w3 = self.connect(ipc)
-        self.instance = self.w3.eth.contract(self.addr, abi=self.abi)
-
-        # account related
-        self.addr =  self.get_main_addr(node_info)
-        self.w3.eth.defaultAccount = self.addr
-
-    def connect(self, ipc):
-        try:
-            w3 = Web3(Web3.IPCProvider(ipc))
-            w3.middleware_onion.inject(web3.middleware.geth_poa_middleware, layer=0)
-            if not w3.isConnected():
-                raise Exception
-        except:
-            print(f"Could not connect to IPC '{ipc}'")
-            sys.exit(1)
-
-        return w3
-
-    def get_main_addr(self, node_info):
-        """Gets account address"""
-        try:
-            with open(node_info) as f:
-                data = json.load(f)
-        except:
-            print("Could not read node's info file 'info.json'.")
-            sys.exit(1)
-
-        return data["acc_addrs"]["main"]
-
-    def read_contract_info(self, info_file):
-        """Retrieves addr and ABI from config file."""
-        try:
-            with open(info_file) as f:
-                contract_dict = json.load(f)
-        except:
-            print(f"Could not read contract's info file '{info_file}.'")
-            sys.exit(1)
-
-        return contract_dict["addr"], contract_dict["get_abi"]
-
-    def unlock_acc(self):
-        """Unlocks given main account."""
-        passphrase = getpass()
-        try:
-            self.w3.geth.personal.unlockAccount(self.addr, passphrase)
-            print("Correct.\n")
-        except:
-            print(f"\nCould not unlock node's main account '{self.addr}' with given password.")
-            sys.exit(1)
-
-    def call(self, func_name, *args):
-        """Calls the contract functions."""
-        self.unlock_acc()
-        return self.caller(func_name, *args)
-
-    def caller(self, func_name, *args):
-        raise NotImplementedError
-
 class Governing(Contract):
     """Represents an API to the governing contracts."""
+    READ_ONLY = ["is"]
 
     def caller(self, func_name, *args):
         """Handles calls to contract."""
@@ -95,12 +26,12 @@ class Governing(Contract):
 
         if func_name == "add":
             t, addr = args
-            tx_hash = self.instance.functions.makeProposal(addr, type_to_int[t], 0).transact({"gas": 1000000})
+            tx_hash = self.send(self.instance.functions.makeProposal(addr, type_to_int[t], 0), 1000000)
             tx_receipt = self.w3.eth.waitForTransactionReceipt(tx_hash)
             return self.instance.events.NewProposal().processReceipt(tx_receipt)
         elif func_name == "remove":
             t, addr = args
-            tx_hash = self.instance.functions.makeProposal(addr, type_to_int[t], 1).transact({"gas": 1000000})
+            tx_hash = self.send(self.instance.functions.makeProposal(addr, type_to_int[t], 1), 1000000)
             tx_receipt = self.w3.eth.waitForTransactionReceipt(tx_hash)
             return self.instance.events.NewProposal().processReceipt(tx_receipt)
         elif func_name == "is":
@@ -131,19 +62,26 @@ class Governing(Contract):
                 except:
                     return False
         elif func_name == "vote":
-            tx_hash = self.instance.functions.vote(args[0]).transact({"gas": 1000000})
+            tx_hash = self.send(self.instance.functions.vote(args[0]), 1000000)
             tx_receipt = self.w3.eth.waitForTransactionReceipt(tx_hash)
             return self.instance.events.NewVote().processReceipt(tx_receipt)
         else:
             print(f"Unkown function name '{func_name}'.")
             sys.exit(1)
 
+def call_args(args):
+    """Returns the contract function name and its arguments of a subcommand."""
+    if args.cmd in ["add", "remove", "is"]:
+        return args.cmd, (args.t, args.a)
+    elif args.cmd == "vote":
+        return "vote", (args.i,)
+
+    return None
+
 def arg_parser():
     """Defines parser for command line input."""
     parser = argparse.ArgumentParser(prog=PROG, description="Command line wrapper to interact with governing contract.")
-    parser.add_argument("--ipc", help="Path to 'geth.ipc'.", default=RPC_IPC, metavar="path/to/ipc", type=str)
-    parser.add_argument("--info", help=f"Path to '{CONTRACT_NAME}-contract.info'.", default=CONTRACT_INFO_FILE, metavar=f"/path/to/{CONTRACT_NAME}.info", type=str)
-    parser.add_argument("--node-info", help=f"Path to node's 'info.json'.", default=NODE_INFO_FILE, metavar="/path/to/info.json", type=str)
+    add_node_args(parser, CONTRACT_NAME)
     subparsers = parser.add_subparsers(dest="cmd")
 
     # add subcmd
@@ -169,6 +107,15 @@ def arg_parser():
 
 def main():
     args = arg_parser().parse_args()
+    call = call_args(args)
+    if call is not None:
+        # a running node daemon answers without loading web3 or asking for the password
+        result = daemon_call(CONTRACT_NAME, args, *call)
+        if result is not None:
+            print(">", result)
+            return
+
+    from web3 import Web3
     if "a" in vars(args).keys():
         try:
             args.a = Web3.toChecksumAddress(args.a)
@@ -178,6 +125,9 @@ def main():
 
     contract = Governing(args.info, args.node_info, args.ipc)
 
+    if args.local_sign and call is not None and call[0] not in contract.READ_ONLY:
+        contract.load_key(args.keystore)
+
     # check which subcmd was used and act accordingly
     if args.cmd == "add":
         print(">", contract.call("add", args.t, args.a))
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import socket
+import socketserver
+import threading
+import importlib.machinery
+import importlib.util
+from getpass import getpass
+import argparse
+
+from nodelib import NODE_INFO_FILE, RPC_IPC, KEYSTORE, NODED_SOCKET, Signer, get_main_addr, read_keyfile
+
+PROG = sys.argv[0]
+
+# seconds the main account stays unlocked and the daemon serves calls
+WINDOW = 3600
+
+# command line tools whose contract wrappers the daemon serves, by contract name
+SCRIPTS = {
+    "CBDC": "/bin/cbdc",
+    "CCBDC": "/bin/ccbdc",
+    "Governing": "/bin/governing"
+}
+
+class Handler(socketserver.StreamRequestHandler):
+    """Answers one JSON request per connection with one JSON answer."""
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            answer = self.server.serve(request)
+        except (ValueError, KeyError, TypeError) as err:
+            answer = {"served": True, "error": f"Invalid request: {err}"}
+
+        self.wfile.write((json.dumps(answer) + "\n").encode("utf-8"))
+
+class Daemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Represents a node's daemon. It holds the node's main account unlocked and serves the calls of the contract command line tools over a unix socket, so that these neither load web3 nor connect to geth themselves."""
+    daemon_threads = True
+
+    def __init__(self, path, ipc, node_info, private_key=None):
+        self.ipc = ipc
+        self.node_info = node_info
+        self.private_key = private_key
+        self.nonces = None
+        self.signer = None
+        self.contracts = {}
+        self.lock = threading.Lock()
+
+        super().__init__(path, Handler)
+        os.chmod(path, 0o600)
+
+    def contract(self, name, info_file):
+        """Returns the wrapper of a contract, loading its command line tool and connecting to geth only once."""
+        with self.lock:
+            if (name, info_file) not in self.contracts:
+                loader = importlib.machinery.SourceFileLoader(name.lower(), SCRIPTS[name])
+                module = importlib.util.module_from_spec(importlib.util.spec_from_loader(loader.name, loader))
+                loader.exec_module(module)
+                contract = getattr(module, name)(info_file, self.node_info, self.ipc)
+
+                # all contracts share one nonce sequence and signer, so that their transactions do not take the same nonces
+                if self.nonces is None:
+                    self.nonces = contract.nonces
+                contract.nonces = self.nonces
+                if self.private_key is not None:
+                    if self.signer is None:
+                        self.signer = Signer(contract.w3, contract.addr, self.private_key, self.nonces)
+                    contract.signer = self.signer
+                self.contracts[(name, info_file)] = contract
+
+            return self.contracts[(name, info_file)]
+
+    def serve(self, request):
+        """Serves a call of a contract function. Calls of other accounts or contracts are not served, their tools fall back to calling geth themselves."""
+        if request["node_info"] != self.node_info:
+            return {"served": False}
+        if request.get("stop"):
+            threading.Thread(target=self.shutdown).start()
+            return {"served": True, "result": "Stopped."}
+
+        name = request["contract"]
+        if not os.path.isfile(SCRIPTS.get(name, "")):
+            return {"served": False}
+
+        args = request["args"]
+        if any(isinstance(arg, str) and arg.startswith("0x") for arg in args):
+            from web3 import Web3
+            try:
+                args = [Web3.toChecksumAddress(arg) if isinstance(arg, str) and arg.startswith("0x") else arg for arg in args]
+            except ValueError:
+                return {"served": True, "error": "Invalid address format"}
+
+        try:
+            contract = self.contract(name, request["info"])
+            return {"served": True, "result": str(contract.caller(request["func"], *args))}
+        except (Exception, SystemExit) as err:
+            # the wrappers exit on errors, which must not end the daemon
+            return {"served": True, "error": str(err) or type(err).__name__}
+
+def is_running(path):
+    """Checks if a daemon answers on given socket."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            return True
+    except OSError:
+        return False
+
+def decrypt_key(keystore_dir, node_info):
+    """Decrypts the node's main account key from its keystore, transactions are then signed by the daemon instead of by geth."""
+    from eth_account import Account
+
+    addr = get_main_addr(node_info)
+    keyfile = read_keyfile(keystore_dir, addr)
+    passphrase = getpass()
+    try:
+        private_key = Account.decrypt(keyfile, passphrase)
+        print("Correct.\n")
+    except:
+        print(f"\nCould not decrypt node's main account '{addr}' with given password.")
+        sys.exit(1)
+
+    return private_key
+
+def unlock_acc(ipc, node_info, window):
+    """Unlocks the node's main account for the given window."""
+    from web3 import Web3
+
+    addr = get_main_addr(node_info)
+    w3 = Web3(Web3.IPCProvider(ipc))
+    passphrase = getpass()
+    try:
+        w3.geth.personal.unlockAccount(addr, passphrase, window)
+        print("Correct.\n")
+    except:
+        print(f"\nCould not unlock node's main account '{addr}' with given password.")
+        sys.exit(1)
+
+    return w3, addr
+
+def detach():
+    """Moves the process into the background, the parent process exits."""
+    if os.fork() != 0:
+        os._exit(0)
+    os.setsid()
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in [0, 1, 2]:
+        os.dup2(devnull, fd)
+
+def start(args):
+    """Unlocks the main account and serves calls until the unlock window ends."""
+    path = os.path.join(os.path.dirname(args.ipc), NODED_SOCKET)
+    if is_running(path):
+        print(f"A daemon is running on '{path}' already.")
+        sys.exit(1)
+    if os.path.exists(path):
+        os.remove(path)
+
+    node_info = os.path.abspath(args.node_info)
+    if args.local_sign:
+        private_key = decrypt_key(args.keystore, node_info)
+    else:
+        w3, addr = unlock_acc(args.ipc, node_info, args.w)
+    server = Daemon(path, args.ipc, node_info, private_key=private_key if args.local_sign else None)
+    print(f"> Serving on '{path}' for {args.w} seconds.")
+    if not args.foreground:
+        detach()
+
+    # the daemon ends with the unlock window, so that calls never run into a locked account
+    timer = threading.Timer(args.w, server.shutdown)
+    timer.daemon = True
+    timer.start()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.remove(path)
+        if not args.local_sign:
+            try:
+                w3.geth.personal.lockAccount(addr)
+            except:
+                pass
+
+def stop(args):
+    """Stops the daemon running next to the IPC."""
+    path = os.path.join(os.path.dirname(args.ipc), NODED_SOCKET)
+    request = {"contract": "", "node_info": os.path.abspath(args.node_info), "stop": True}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            answer = json.loads(sock.makefile(encoding="utf-8").readline())
+    except (OSError, ValueError):
+        print(f"No daemon is running on '{path}'.")
+        sys.exit(1)
+
+    print(">", answer.get("result", "Not stopped, the daemon serves another account."))
+
+def arg_parser():
+    """Defines parser for command line input."""
+    parser = argparse.ArgumentParser(prog=PROG, description="Daemon that keeps the node's main account unlocked and serves 'cbdc', 'ccbdc' and 'governing' calls over a unix socket.")
+    parser.add_argument("--ipc", help="Path to 'geth.ipc', the daemon's socket is created next to it.", default=RPC_IPC, metavar="path/to/ipc", type=str)
+    parser.add_argument("--node-info", help=f"Path to node's 'info.json'.", default=NODE_INFO_FILE, metavar="/path/to/info.json", type=str)
+    subparsers = parser.add_subparsers(dest="cmd")
+
+    # start subcmd
+    start_parser = subparsers.add_parser("start", help="Unlocks the main account and starts the daemon in the background.")
+    start_parser.add_argument("-w", type=int, default=WINDOW, help=f"Seconds the account stays unlocked and the daemon serves calls, defaults to {WINDOW}.", metavar="<window>")
+    start_parser.add_argument("--foreground", action="store_true", help="Does not move the daemon into the background.")
+    start_parser.add_argument("--local-sign", action="store_true", help="Decrypts the key from the node's keystore and signs transactions in the daemon instead of unlocking the account in geth.")
+    start_parser.add_argument("--keystore", help="Path to the node's keystore.", default=KEYSTORE, metavar="path/to/keystore", type=str)
+
+    # stop subcmd
+    subparsers.add_parser("stop", help="Stops the daemon and locks the main account.")
+
+    return parser
+
+def main():
+    args = arg_parser().parse_args()
+
+    if args.cmd == "start":
+        start(args)
+    elif args.cmd == "stop":
+        stop(args)
+    else:
+        arg_parser().print_help()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+# shared parts of the contract command line tools ('cbdc', 'ccbdc', 'governing') and the node daemon ('noded'), the images copy it next to them into '/bin'
+
+import os
+import sys
+import json
+import csv
+import socket
+import itertools
+import threading
+from getpass import getpass
+
+NODE_INFO_FILE= "info.json"
+RPC_IPC = os.path.join("data", "geth.ipc")
+KEYSTORE = os.path.join("data", "keystore")
+NODED_SOCKET = "noded.sock"
+
+# addresses read per JSON-RPC batch request
+READ_CHUNK = 500
+
+class IpcRpc(object):
+    """Represents a raw JSON-RPC connection to geth's IPC, since web3's IPC provider sends no batch requests."""
+    def __init__(self, ipc):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(ipc)
+        self.decoder = json.JSONDecoder()
+        self.buffer = b""
+
+    def read(self):
+        """Reads one JSON answer, geth does not delimit them."""
+        while True:
+            text = self.buffer.decode("utf-8", errors="replace").lstrip()
+            try:
+                answer, end = self.decoder.raw_decode(text)
+                self.buffer = text[end:].encode("utf-8")
+                return answer
+            except ValueError:
+                chunk = self.sock.recv(65536)
+                if chunk == b"":
+                    raise ConnectionError("IPC connection closed by geth.")
+                self.buffer += chunk
+
+    def batch(self, calls):
+        """Calls many JSON-RPC methods in one request. Returns a (result, error message) pair for each call in order."""
+        if calls == []:
+            return []
+        request = [{"jsonrpc": "2.0", "id": i, "method": method, "params": params} for i, (method, params) in enumerate(calls)]
+        self.sock.sendall(json.dumps(request).encode("utf-8"))
+        answers = self.read()
+        if isinstance(answers, dict):
+            raise ConnectionError(f"IPC batch failed: {answers.get('error', {}).get('message')}")
+
+        answers = {answer["id"]: answer for answer in answers}
+        return [(answers[i].get("result"), answers[i].get("error", {}).get("message")) for i in range(len(calls))]
+
+class Nonces(object):
+    """Assigns the nonces of an account's transactions in-process, so that the node is not asked for each one's nonce. The sequence starts at the node's pending nonce and is read from the node again when it went out of step."""
+    # geth's errors for a nonce that is used already, e.g. by a transaction sent elsewhere
+    USED_ERRORS = ["nonce too low", "replacement transaction underpriced"]
+
+    def __init__(self, w3, addr):
+        self.w3 = w3
+        self.addr = addr
+        self.nonce = None
+        self.lock = threading.Lock()
+
+    def sync(self):
+        """Continues with the node's pending nonce. Nonces of dropped transactions are used again, which closes the gap later transactions are queued behind."""
+        with self.lock:
+            self.nonce = self.w3.eth.getTransactionCount(self.addr, "pending")
+
+    def send(self, send_tx):
+        """Sends a transaction with the next nonce by calling 'send_tx(nonce)', returns its hash. If the node reports the nonce as used, it is read from the node again and the transaction sent once more."""
+        with self.lock:
+            for retry in [False, True]:
+                if self.nonce is None:
+                    self.nonce = self.w3.eth.getTransactionCount(self.addr, "pending")
+                try:
+                    tx_hash = send_tx(self.nonce)
+                except ValueError as err:
+                    if retry or not any(error in str(err) for error in self.USED_ERRORS):
+                        raise
+                    self.nonce = None
+                    continue
+
+                # a rejected transaction does not use up its nonce
+                self.nonce += 1
+                return tx_hash
+
+class Signer(object):
+    """Signs the transactions of an account locally, so that geth does not sign them under its account lock. Their nonces are taken from given nonce sequence."""
+    def __init__(self, w3, addr, private_key, nonces):
+        self.w3 = w3
+        self.addr = addr
+        self.private_key = private_key
+        self.nonces = nonces
+        self.chain_id = w3.eth.chainId
+        self.gas_price = w3.eth.gasPrice
+
+    def send(self, function, gas):
+        """Signs and sends a transaction calling given contract function, returns its hash."""
+        def send_tx(nonce):
+            tx = function.buildTransaction({"from": self.addr, "gas": gas, "gasPrice": self.gas_price, "nonce": nonce, "chainId": self.chain_id})
+            signed = self.w3.eth.account.sign_transaction(tx, self.private_key)
+            return self.w3.eth.sendRawTransaction(signed.rawTransaction)
+
+        return self.nonces.send(send_tx)
+
+def get_main_addr(node_info):
+    """Gets account address"""
+    try:
+        with open(node_info) as f:
+            return json.load(f)["acc_addrs"]["main"]
+    except:
+        print("Could not read node's info file 'info.json'.")
+        sys.exit(1)
+
+def read_keyfile(keystore_dir, addr):
+    """Returns the keystore file of given address."""
+    try:
+        for name in os.listdir(keystore_dir):
+            with open(os.path.join(keystore_dir, name)) as f:
+                keyfile = json.load(f)
+            if keyfile.get("address", "").lower() == addr[2:].lower():
+                return keyfile
+    except:
+        pass
+
+    print(f"Could not read the key of '{addr}' from keystore '{keystore_dir}'.")
+    sys.exit(1)
+
+class Contract(object):
+    """Represents a contract wrapper to easily interact."""
+    # functions that only read the chain and need no unlocked account
+    READ_ONLY = []
+
+    def __init__(self, info_file, node_info, ipc):
+        self.ipc = ipc
+        self.addr, self.abi = self.read_contract_info(info_file)
+        self.w3 = self.connect(ipc)
+        self.instance = self.w3.eth.contract(self.addr, abi=self.abi)
+
+        # account related
+        self.addr = get_main_addr(node_info)
+        self.w3.eth.defaultAccount = self.addr
+        self.nonces = Nonces(self.w3, self.addr)
+        self.signer = None
+
+    def connect(self, ipc):
+        # web3 is only loaded if no daemon serves the call, its import is the slowest part of a call
+        import web3
+        from web3 import Web3
+
+        try:
+            w3 = Web3(Web3.IPCProvider(ipc))
+            w3.middleware_onion.inject(web3.middleware.geth_poa_middleware, layer=0)
+            if not w3.isConnected():
+                raise Exception
+        except:
+            print(f"Could not connect to IPC '{ipc}'")
+            sys.exit(1)
+
+        return w3
+
+    def read_contract_info(self, info_file):
+        """Retrieves addr and ABI from config file."""
+        try:
+            with open(info_file) as f:
+                contract_dict = json.load(f)
+        except:
+            print(f"Could not read contract's info file '{info_file}.'")
+            sys.exit(1)
+
+        return contract_dict["addr"], contract_dict["get_abi"]
+
+    def unlock_acc(self, duration=None):
+        """Unlocks given main account."""
+        passphrase = getpass()
+        try:
+            self.w3.geth.personal.unlockAccount(self.addr, passphrase, duration)
+            print("Correct.\n")
+        except:
+            print(f"\nCould not unlock node's main account '{self.addr}' with given password.")
+            sys.exit(1)
+
+    def load_key(self, keystore_dir):
+        """Decrypts the main account's key from the node's keystore, transactions are then signed locally instead of by geth."""
+        from eth_account import Account
+
+        keyfile = read_keyfile(keystore_dir, self.addr)
+        passphrase = getpass()
+        try:
+            private_key = Account.decrypt(keyfile, passphrase)
+            print("Correct.\n")
+        except:
+            print(f"\nCould not decrypt node's main account '{self.addr}' with given password.")
+            sys.exit(1)
+
+        self.signer = Signer(self.w3, self.addr, private_key, self.nonces)
+
+    def send(self, function, gas):
+        """Sends a transaction calling given contract function and returns its hash. It is signed locally if the key is loaded, by geth otherwise, either way with the next nonce of the account's sequence."""
+        if self.signer is not None:
+            return self.signer.send(function, gas)
+
+        return self.nonces.send(lambda nonce: function.transact({"gas": gas, "nonce": nonce}))
+
+    def read_many(self, func_name, addrs, out, block=None, chunk_size=READ_CHUNK, args=()):
+        """Reads a contract function for many addresses with batches of 'eth_call's and writes one CSV row per address. All reads are made at the given block, the latest one of each batch otherwise."""
+        from web3 import Web3
+
+        rpc = IpcRpc(self.ipc)
+        tag = hex(block) if block is not None else "latest"
+        writer = csv.writer(out)
+        writer.writerow(["address", func_name, "error"])
+
+        addrs = iter(addrs)
+        while True:
+            chunk = list(itertools.islice(addrs, chunk_size))
+            if chunk == []:
+                break
+
+            calls = []
+            for addr in chunk:
+                try:
+                    data = self.instance.encodeABI(fn_name=func_name, args=[*args, Web3.toChecksumAddress(addr)])
+                    calls.append(("eth_call", [{"to": self.instance.address, "data": data}, tag]))
+                except ValueError:
+                    calls.append(None)
+
+            answers = iter(rpc.batch([call for call in calls if call is not None]))
+            for addr, call in zip(chunk, calls):
+                if call is None:
+                    writer.writerow([addr, "", "Invalid address format"])
+                    continue
+                result, error = next(answers)
+                if error is None and result not in [None, "0x"]:
+                    writer.writerow([addr, int(result, 16), ""])
+                else:
+                    writer.writerow([addr, "", error or "Empty result"])
+            out.flush()
+
+    def call(self, func_name, *args):
+        """Calls the contract functions."""
+        if func_name not in self.READ_ONLY and self.signer is None:
+            self.unlock_acc()
+        return self.caller(func_name, *args)
+
+    def caller(self, func_name, *args):
+        raise NotImplementedError
+
+def read_addrs(path):
+    """Yields the addresses of a file, one per line or in the first column of a CSV file. A header line is skipped."""
+    with open(path) as f:
+        for row in f:
+            addr = row.split(",")[0].strip()
+            if addr != "" and addr.lower() != "address":
+                yield addr
+
+def is_batch_read(args):
+    """Checks if a read subcommand reads many addresses, which is answered as CSV."""
+    return args.f is not None or len(args.a) > 1 or args.b is not None or args.pin or args.o is not None
+
+def add_read_args(parser, help):
+    """Adds the arguments of a read subcommand, which takes one or many addresses."""
+    addrs = parser.add_mutually_exclusive_group(required=True)
+    addrs.add_argument("-a", nargs="+", type=str, help=help, metavar="<addr>")
+    addrs.add_argument("-f", type=str, help="File with one address per line, or in the first column of a CSV file.", metavar="<file>")
+    parser.add_argument("-b", type=int, help="Block number to read at, defaults to the latest block.", metavar="<block>")
+    parser.add_argument("--pin", action="store_true", help="Reads all addresses at the block that is the latest one at the start.")
+    parser.add_argument("-o", type=str, help="CSV file to write the results to, defaults to stdout.", metavar="<file>")
+    parser.add_argument("--chunk", type=int, default=READ_CHUNK, help=f"Addresses per batch request, defaults to {READ_CHUNK}.", metavar="<size>")
+
+def add_node_args(parser, contract_name):
+    """Adds the arguments every tool takes to find the node's IPC, keystore and info files."""
+    parser.add_argument("--ipc", help="Path to 'geth.ipc'.", default=RPC_IPC, metavar="path/to/ipc", type=str)
+    parser.add_argument("--info", help=f"Path to '{contract_name}-contract.info'.", default=f"{contract_name}-contract.info", metavar=f"/path/to/{contract_name}.info", type=str)
+    parser.add_argument("--node-info", help=f"Path to node's 'info.json'.", default=NODE_INFO_FILE, metavar="/path/to/info.json", type=str)
+    parser.add_argument("--local-sign", help="Signs transactions locally with the key from the node's keystore instead of unlocking the account in geth.", action="store_true")
+    parser.add_argument("--keystore", help="Path to the node's keystore.", default=KEYSTORE, metavar="path/to/keystore", type=str)
+
+def daemon_call(contract_name, args, func_name, *func_args):
+    """Sends a call to the node's daemon ('noded'), if it runs next to the given IPC. Returns None if no daemon serves the call."""
+    request = {
+        "contract": contract_name,
+        "info": os.path.abspath(args.info),
+        "node_info": os.path.abspath(args.node_info),
+        "func": func_name,
+        "args": list(func_args)
+    }
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(os.path.join(os.path.dirname(args.ipc), NODED_SOCKET))
+            sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            answer = json.loads(sock.makefile(encoding="utf-8").readline())
+    except (OSError, ValueError):
+        return None
+
+    if not answer.get("served"):
+        return None
+    if "error" in answer:
+        print(answer["error"])
+        sys.exit(1)
+
+    return answer["result"]
@@ -6,13 +6,22 @@ import subprocess
 import signal
 import shutil
 import pathlib
-import yaml
 import json
 import time
 import traceback
-
-import web3
-from web3 import Web3
+import threading
+import hashlib
+import uuid
+import datetime
+import urllib.request
+import asyncio
+import collections
+import socket
+import http.client
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# yaml, web3 and the crypto libraries are imported where they are needed, since importing them dominates the startup time of every subcommand
 
 # UTILS
 class Deco():
@@ -28,34 +37,597 @@ class Deco():
     RESET = "\033[0m"
 
 class Shell():
-    """Represents a simpel shell environment to call commands."""
-    @classmethod
-    def call(cls, cmd, stdin=None, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=None, invis=False, check_ret=False):
-        """Calls a shell command and handles return value."""
-        process = subprocess.Popen(cmd.split(), stdout=stdout, stderr=stderr, stdin=subprocess.PIPE, env=env)
-
-        # check if process should terminate or runs invisibly in background and act accordingly
-        if not invis and stdin is None:
-            stdout, stderr = process.communicate()
-            stdout = stdout.decode("utf-8")
-            stderr = stderr.decode("utf-8")
-            process.wait()
-            
-            if check_ret and process.returncode != 0:
-                raise ShellCommandErr(f"Command '{cmd}' has terminated with non-zero error code '{process.returncode}' and message:\n\t{stderr}")
-            
-            return stdout
-        elif not invis and stdin is not None:
-            inbytes = bytes(stdin.encode("utf-8"))
-            stdout, stderr = process.communicate(inbytes)
-            stdout = stdout.decode("utf-8")
-            stderr = stderr.decode("utf-8")
-            process.wait()
-            
-            if check_ret and process.returncode != 0:
-                raise ShellCommandErr(f"Command '{cmd}' has terminated with non-zero error code '{process.returncode}' and message:\n\t{stderr}")
-            
-            return stdout
+    """Represents a simpel shell environment to call commands. Commands run as asyncio subprocesses with a timeout, so that many of them can be awaited concurrently and a hanging command cannot stall the whole command run."""
+    # seconds a command may run before it is killed, None for no limit
+    TIMEOUT = 300
+
+    # bytes read from a command's output at once
+    CHUNK_SIZE = 65536
+    # chunks of a command's stderr kept for error messages
+    STDERR_CHUNKS = 16
+
+    @classmethod
+    def call(cls, cmd, stdin=None, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=None, cwd=None, invis=False, check_ret=False, timeout=TIMEOUT, on_line=None):
+        """Calls a shell command and handles return value. The command is run in 'cwd' if given, so that callers never have to change the process-wide working directory. Blocking wrapper around 'Shell.run'."""
+        # invisible processes run in background and are not waited for
+        if invis:
+            subprocess.Popen(cmd.split(), stdout=stdout, stderr=stderr, stdin=subprocess.PIPE, env=env, cwd=cwd)
+            return None
+
+        return cls.sync(cls.run(cmd, stdin=stdin, env=env, cwd=cwd, check_ret=check_ret, timeout=timeout, on_line=on_line))
+
+    @classmethod
+    async def run(cls, cmd, stdin=None, env=None, cwd=None, check_ret=False, timeout=TIMEOUT, on_line=None, capture=True):
+        """Runs a shell command and returns its stdout. Output lines of stdout and stderr are passed to 'on_line' while the command runs, with 'capture=False' stdout is not kept in memory. The command is killed if it does not terminate within 'timeout' seconds or if the awaiting task is cancelled."""
+        process = await asyncio.create_subprocess_exec(*cmd.split(), stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, env=env, cwd=cwd)
+        stdout = []
+        stderr = collections.deque(maxlen=cls.STDERR_CHUNKS)
+
+        async def feed():
+            try:
+                if stdin is not None:
+                    process.stdin.write(stdin.encode("utf-8"))
+                    await process.stdin.drain()
+                process.stdin.close()
+            except (BrokenPipeError, ConnectionResetError):
+                # the command terminated without reading all of its input
+                pass
+
+        async def read(stream, chunks):
+            rest = b""
+            while True:
+                chunk = await stream.read(cls.CHUNK_SIZE)
+                if chunk == b"":
+                    break
+                if chunks is not None:
+                    chunks.append(chunk)
+                if on_line is not None:
+                    *lines, rest = (rest + chunk).split(b"\n")
+                    for line in lines:
+                        on_line(line.decode("utf-8", errors="replace"))
+            if on_line is not None and rest != b"":
+                on_line(rest.decode("utf-8", errors="replace"))
+
+        io = asyncio.gather(feed(), read(process.stdout, stdout if capture else None), read(process.stderr, stderr), process.wait())
+        # the outcome of a cancelled gather is retrieved here, it is reported by the exception raised below
+        io.add_done_callback(lambda future: future.cancelled() or future.exception())
+        try:
+            await asyncio.wait_for(io, timeout)
+        except asyncio.TimeoutError:
+            raise ShellTimeoutErr(f"Command '{cmd}' did not terminate within {timeout} seconds and was killed.")
+        finally:
+            # killing the command on timeouts, cancellation and errors
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+        if check_ret and process.returncode != 0:
+            message = b"".join(stderr).decode("utf-8", errors="replace")
+            raise ShellCommandErr(f"Command '{cmd}' has terminated with non-zero error code '{process.returncode}' and message:\n\t{message}")
+
+        return b"".join(stdout).decode("utf-8")
+
+    @classmethod
+    async def gather(cls, coros, jobs=None, cancel=True):
+        """Awaits the given coroutines concurrently, at most 'jobs' at a time, and returns their results in order. If one of them fails, the others are cancelled, or with 'cancel=False' awaited, before the first error is raised."""
+        semaphore = asyncio.Semaphore(jobs) if jobs is not None else None
+
+        async def limited(coro):
+            if semaphore is None:
+                return await coro
+            async with semaphore:
+                return await coro
+
+        tasks = [asyncio.ensure_future(limited(coro)) for coro in coros]
+        if not cancel:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            return results
+
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    @classmethod
+    def sync(cls, coro):
+        """Runs a coroutine to completion from synchronous code. Inside a running event loop, e.g. synchronous code called by a coroutine, the coroutine is run in a thread of its own."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
+
+class Rpc():
+    """Represents a minimal JSON-RPC client to probe nodes without a web3 connection."""
+    @classmethod
+    def call(cls, url, method, params=[], timeout=2):
+        """Calls a JSON-RPC method and returns its result."""
+        payload = json.dumps({"jsonrpc": "2.0", "method": method, "params": params, "id": 1}).encode("utf-8")
+        req = urllib.request.Request(url, data=payload, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=timeout) as res:
+            data = json.loads(res.read().decode("utf-8"))
+
+        if "error" in data:
+            raise RpcErr(f"RPC method '{method}' at '{url}' failed with: {data['error']}")
+
+        return data["result"]
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """Represents a HTTP connection over a unix socket."""
+    def __init__(self, path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+class DockerApi():
+    """Represents a minimal client of the Docker Engine API on the docker daemon's unix socket. Every thread keeps one persistent connection, so that container operations neither fork the docker command line tool nor open a new connection."""
+    SOCKET = "/var/run/docker.sock"
+
+    # seconds to wait for an answer of the docker daemon
+    TIMEOUT = 120
+
+    AVAILABLE = None
+    LOCAL = threading.local()
+
+    @classmethod
+    def socket_path(cls):
+        """Returns the path of the docker socket, None if docker is not reachable over a unix socket."""
+        host = os.environ.get("DOCKER_HOST")
+        if host is None:
+            return cls.SOCKET
+        if host.startswith("unix://"):
+            return host[len("unix://"):]
+
+        return None
+
+    @classmethod
+    def available(cls):
+        """Checks once if the docker daemon answers on its unix socket."""
+        if cls.AVAILABLE is None:
+            try:
+                cls.AVAILABLE = cls.socket_path() is not None and cls.request("GET", "/_ping")[0] == 200
+            except (OSError, http.client.HTTPException, DockerApiErr):
+                cls.AVAILABLE = False
+
+        return cls.AVAILABLE
+
+    @classmethod
+    def connection(cls):
+        """Returns the persistent connection of the current thread."""
+        conn = getattr(cls.LOCAL, "conn", None)
+        if conn is None:
+            conn = UnixHTTPConnection(cls.socket_path(), timeout=cls.TIMEOUT)
+            cls.LOCAL.conn = conn
+
+        return conn
+
+    @classmethod
+    def request(cls, method, path, query=None, body=None, allow=()):
+        """Sends a request to the docker daemon and returns the status and the decoded JSON answer. Error statuses raise a DockerApiErr, unless they are allowed."""
+        url = path + ("?" + urllib.parse.urlencode(query) if query else "")
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+
+        # a kept alive connection may have been closed by the daemon, it is reopened once
+        for retry in [False, True]:
+            conn = cls.connection()
+            try:
+                conn.request(method, url, body=data, headers=headers)
+                res = conn.getresponse()
+                payload = res.read()
+                break
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                cls.LOCAL.conn = None
+                if retry:
+                    raise
+
+        answer = None
+        if payload != b"" and res.getheader("Content-Type", "").startswith("application/json"):
+            answer = json.loads(payload)
+        if res.status >= 400 and res.status not in allow:
+            message = answer.get("message") if isinstance(answer, dict) else payload.decode("utf-8", errors="replace")
+            raise DockerApiErr(f"Docker API request '{method} {path}' failed with status '{res.status}': {message}")
+
+        return res.status, answer
+
+    @classmethod
+    def events(cls, filters, since, until):
+        """Yields the docker events matching given filters between the unix times 'since' and 'until'. The events are streamed on a connection of their own, which ends at 'until'."""
+        query = {"since": f"{since:.9f}", "until": f"{until:.9f}", "filters": json.dumps(filters)}
+        conn = UnixHTTPConnection(cls.socket_path(), timeout=max(until - time.time(), 0) + cls.TIMEOUT)
+        try:
+            conn.request("GET", "/events?" + urllib.parse.urlencode(query))
+            res = conn.getresponse()
+            if res.status >= 400:
+                raise DockerApiErr(f"Docker API request 'GET /events' failed with status '{res.status}'.")
+            while True:
+                line = res.readline()
+                if line == b"":
+                    break
+                if line.strip() != b"":
+                    yield json.loads(line)
+        finally:
+            conn.close()
+
+class Docker():
+    """Represents the docker daemon and a network-wide snapshot of docker container states. Docker is used through its Engine API if its unix socket is available, otherwise through the docker command line tool. The snapshot is filled by a single query, so that status checks do not cost one docker call per node."""
+    CONTAINERS = None
+    LOCK = threading.Lock()
+
+    # seconds to wait for stopped containers to be removed
+    REMOVE_TIMEOUT = 30
+
+    @classmethod
+    def refresh(cls):
+        """Queries all containers at once and replaces the snapshot."""
+        containers = {}
+        if DockerApi.available():
+            _, answer = DockerApi.request("GET", "/containers/json", query={"all": 1})
+            for container in answer:
+                for name in container["Names"]:
+                    containers[name.lstrip("/")] = container["Id"][:12]
+        else:
+            cmd = "docker ps -a --no-trunc --format {{.Names}};{{.ID}}"
+            out = Shell.call(cmd, check_ret=True)
+            for line in out.splitlines():
+                if line == "":
+                    continue
+                name, id = line.split(";", 1)
+                containers[name] = id[:12]
+
+        with cls.LOCK:
+            cls.CONTAINERS = containers
+
+        return containers
+
+    @classmethod
+    def invalidate(cls):
+        """Drops the snapshot, the next status check will query docker again."""
+        with cls.LOCK:
+            cls.CONTAINERS = None
+
+    @classmethod
+    def containers(cls):
+        """Returns the snapshot of all containers by name, querying docker only if there is none yet."""
+        with cls.LOCK:
+            containers = cls.CONTAINERS
+        if containers is None:
+            containers = cls.refresh()
+
+        return containers
+
+    @classmethod
+    def exists(cls, name):
+        """Checks if a container with the given name exists."""
+        return name in cls.containers()
+
+    @classmethod
+    def add(cls, name, id):
+        """Records a container started by this process."""
+        cls.containers()
+        with cls.LOCK:
+            cls.CONTAINERS[name] = id
+
+    @classmethod
+    def remove(cls, name):
+        """Records a container stopped by this process."""
+        cls.containers()
+        with cls.LOCK:
+            cls.CONTAINERS.pop(name, None)
+
+    @classmethod
+    def run_cmd(cls, spec):
+        """Returns the 'docker run ...' command of a container spec, see 'Node.container_spec'."""
+        args = ["docker run -d --rm", f"--user {spec['user']}", f"-w {spec['workdir']}"]
+        args += [f"-v {host_dir}:{dir}" for host_dir, dir in spec["binds"].items()]
+        args += [f"--name {spec['name']}", f"--ip {spec['ip']}"]
+        args += [f"-p {host_port}:{port}" for port, host_port in spec["ports"].items()]
+        args += [f"--network {spec['network']}"]
+        args += [f"-e {key}={value}" for key, value in spec["env"].items()]
+        args += [spec["image"]] + spec["cmd"]
+
+        return " ".join(args)
+
+    @classmethod
+    def create_body(cls, spec):
+        """Returns the Engine API body creating the container of a container spec."""
+        ports = {f"{port}/tcp": [{"HostPort": str(host_port)}] for port, host_port in spec["ports"].items()}
+        body = {
+            "Image": spec["image"],
+            "User": str(spec["user"]),
+            "WorkingDir": spec["workdir"],
+            "Env": [f"{key}={value}" for key, value in spec["env"].items()],
+            "ExposedPorts": {port: {} for port in ports.keys()},
+            "HostConfig": {
+                "AutoRemove": True,
+                "Binds": [f"{host_dir}:{dir}" for host_dir, dir in spec["binds"].items()],
+                "PortBindings": ports,
+                "NetworkMode": spec["network"]
+            },
+            "NetworkingConfig": {
+                "EndpointsConfig": {spec["network"]: {"IPAMConfig": {"IPv4Address": spec["ip"]}}}
+            }
+        }
+        if spec["cmd"] != []:
+            body["Cmd"] = spec["cmd"]
+
+        return body
+
+    @classmethod
+    def run(cls, spec):
+        """Creates and starts the container of a container spec and returns its short id."""
+        return Shell.sync(cls.run_async(spec))
+
+    @classmethod
+    async def run_async(cls, spec):
+        """Awaits creating and starting the container of a container spec and returns its short id."""
+        if not DockerApi.available():
+            out = await Shell.run(cls.run_cmd(spec), check_ret=True)
+            return out.replace("\n", "")[:12]
+
+        def run():
+            _, answer = DockerApi.request("POST", "/containers/create", query={"name": spec["name"]}, body=cls.create_body(spec))
+            DockerApi.request("POST", f"/containers/{answer['Id']}/start", allow=(304,))
+            return answer["Id"][:12]
+
+        # the API calls block, so they are made in a worker thread with a connection of its own
+        return await asyncio.to_thread(run)
+
+    @classmethod
+    def stop(cls, name):
+        """Stops a container."""
+        if DockerApi.available():
+            DockerApi.request("POST", f"/containers/{name}/stop", allow=(304, 404))
+        else:
+            Shell.call(f"docker stop {name}", check_ret=False)
+
+    @classmethod
+    def wait_removed(cls, names, since):
+        """Waits until the given containers, which are removed automatically when stopped, are gone, so that their names can be used again right away. The docker events stream is used if available, the command line tool's 'docker stop' only returns once the container is stopped anyway."""
+        names = set(names)
+        if names == set() or not DockerApi.available():
+            return
+
+        filters = {"type": ["container"], "event": ["destroy"], "container": sorted(names)}
+        for event in DockerApi.events(filters, since, time.time() + cls.REMOVE_TIMEOUT):
+            names.discard(event.get("Actor", {}).get("Attributes", {}).get("name"))
+            if names == set():
+                return
+
+        raise DockerApiErr(f"Containers {sorted(names)} were not removed within {cls.REMOVE_TIMEOUT} seconds.")
+
+    @classmethod
+    def create_network(cls, name, driver, subnet):
+        """Creates a docker network, if it does not exist yet."""
+        if DockerApi.available():
+            body = {"Name": name, "Driver": driver, "CheckDuplicate": True, "IPAM": {"Config": [{"Subnet": subnet}]}}
+            DockerApi.request("POST", "/networks/create", body=body, allow=(409,))
+        else:
+            Shell.call(f"docker network create -d {driver} --subnet {subnet} {name}")
+
+    @classmethod
+    def remove_network(cls, name):
+        """Removes a docker network."""
+        if DockerApi.available():
+            DockerApi.request("DELETE", f"/networks/{name}")
+        else:
+            Shell.call(f"docker network rm {name}", check_ret=True)
+
+    @classmethod
+    def image_exists(cls, image):
+        """Checks if a docker image with given name and tag exists."""
+        if DockerApi.available():
+            status, _ = DockerApi.request("GET", f"/images/{image}/json", allow=(404,))
+            return status == 200
+
+        try:
+            Shell.call(f"docker image inspect {image}", check_ret=True)
+            return True
+        except ShellCommandErr:
+            return False
+
+    @classmethod
+    def tag_image(cls, image, repo, tag):
+        """Tags a docker image as 'repo:tag'."""
+        if DockerApi.available():
+            DockerApi.request("POST", f"/images/{image}/tag", query={"repo": repo, "tag": tag})
+        else:
+            Shell.call(f"docker image tag {image} {repo}:{tag}", check_ret=True)
+
+    @classmethod
+    def remove_image(cls, image):
+        """Removes a docker image."""
+        if DockerApi.available():
+            DockerApi.request("DELETE", f"/images/{image}")
+        else:
+            Shell.call(f"docker image rm {image}", check_ret=True)
+
+class Files():
+    """Represents copies of big directories, such as a node's chaindata."""
+    # files that are never changed after they have been written
+    IMMUTABLE_SUFFIXES = (".ldb",)
+
+    @classmethod
+    def copy_tree(cls, src, dst):
+        """Copies the directory 'src' to 'dst', which must not exist yet. The copy is copy-on-write (reflink) where the filesystem supports it, otherwise the tree is streamed through tar."""
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        # copies of a big chaindata take as long as they take, they have no timeout
+        try:
+            Shell.call(f"cp -a --reflink=auto {src} {dst}", check_ret=True, timeout=None)
+            return
+        except (ShellCommandErr, OSError):
+            # e.g. a 'cp' without '--reflink', removing a partial copy before streaming
+            if os.path.exists(dst):
+                shutil.rmtree(dst)
+
+        os.makedirs(dst)
+        pack = subprocess.Popen(["tar", "-C", src, "-cf", "-", "."], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        unpack = subprocess.Popen(["tar", "-C", dst, "-xf", "-"], stdin=pack.stdout, stderr=subprocess.PIPE)
+        # only the unpacking tar may read the stream, so that packing stops if unpacking fails
+        pack.stdout.close()
+        _, unpack_err = unpack.communicate()
+        _, pack_err = pack.communicate()
+        if pack.returncode != 0 or unpack.returncode != 0:
+            shutil.rmtree(dst)
+            stderr = (pack_err + unpack_err).decode("utf-8")
+            raise ShellCommandErr(f"Could not copy '{src}' to '{dst}' with tar:\n\t{stderr}")
+
+    @classmethod
+    def link_tree(cls, src, dst):
+        """Copies the directory 'src' to 'dst', which must not exist yet, sharing as much data as possible. The copy is a reflink copy where the filesystem supports it, otherwise immutable files are hardlinked and all other files are copied."""
+        try:
+            Shell.call(f"cp -a --reflink=always {src} {dst}", check_ret=True, timeout=None)
+            return
+        except (ShellCommandErr, OSError):
+            if os.path.exists(dst):
+                shutil.rmtree(dst)
+
+        shutil.copytree(src, dst, symlinks=True, copy_function=cls.link_or_copy)
+
+    @classmethod
+    def link_or_copy(cls, src, dst):
+        """Hardlinks immutable files, i.e. leveldb tables which are never changed once written, and copies all other files."""
+        if src.endswith(cls.IMMUTABLE_SUFFIXES):
+            try:
+                os.link(src, dst)
+                return dst
+            except OSError:
+                pass
+
+        return shutil.copy2(src, dst)
+
+class Keys():
+    """Derives node keys, enodes, addresses and istanbul extraData in-process. The results are identical to the output of 'bootnode' and 'istanbul'."""
+    # order of the secp256k1 curve
+    SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+    # istanbul extraData layout
+    EXTRA_VANITY = 32
+    EXTRA_SEAL = 65
+
+    @classmethod
+    def gen_private_key(cls):
+        """Generates a random secp256k1 private key."""
+        while True:
+            private_key = os.urandom(32)
+            if 0 < int.from_bytes(private_key, "big") < cls.SECP256K1_N:
+                return private_key
+
+    @classmethod
+    def write_nodekey(cls, path, private_key):
+        """Writes a private key as hex like 'bootnode --genkey'."""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(private_key.hex())
+
+    @classmethod
+    def pubkey(cls, private_key):
+        """Returns the uncompressed public key without prefix as hex, like 'bootnode --writeaddress'."""
+        from eth_keys import keys
+        return keys.PrivateKey(private_key).public_key.to_bytes().hex()
+
+    @classmethod
+    def address(cls, pubkey):
+        """Returns the checksummed address of a hex public key, like 'istanbul address'."""
+        from eth_keys import keys
+        return keys.PublicKey(bytes.fromhex(pubkey)).to_checksum_address()
+
+    @classmethod
+    def istanbul_extra(cls, addrs):
+        """Encodes given validator addresses into istanbul extraData, like 'istanbul extra encode'."""
+        import rlp
+        validators = [bytes.fromhex(addr[2:] if addr.startswith("0x") else addr) for addr in addrs]
+        payload = rlp.encode([validators, bytes(cls.EXTRA_SEAL), []])
+
+        return "0x" + (bytes(cls.EXTRA_VANITY) + payload).hex()
+
+class Keystore():
+    """Writes standard V3 keystore files (scrypt, aes-128-ctr) like 'geth account new', without starting geth."""
+    # geth's standard scrypt parameters, test networks may lower them in the network config file
+    DEFAULT_PARAMS = {
+        "scrypt-n": 262144,
+        "scrypt-r": 8,
+        "scrypt-p": 1
+    }
+
+    @classmethod
+    def params(cls, config_dict):
+        """Returns the KDF parameters from the 'keystore' section of the network config file merged with the defaults."""
+        params = dict(cls.DEFAULT_PARAMS)
+        if config_dict is not None:
+            for key, value in config_dict.items():
+                if key not in params:
+                    raise InvalidKeystoreParamErr(f"Invalid keystore parameter '{key}', valid ones are {list(params.keys())}.")
+                params[key] = int(value)
+
+        return params
+
+    @classmethod
+    def encrypt(cls, private_key, passphrase, params):
+        """Encrypts a private key into a V3 keystore dictionary."""
+        from eth_utils import keccak
+        from Crypto.Cipher import AES
+        from Crypto.Util import Counter
+
+        n, r, p = params["scrypt-n"], params["scrypt-r"], params["scrypt-p"]
+        salt = os.urandom(32)
+        derived_key = hashlib.scrypt(passphrase.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 1024 * 1024, dklen=32)
+
+        iv = os.urandom(16)
+        counter = Counter.new(128, initial_value=int.from_bytes(iv, "big"))
+        ciphertext = AES.new(derived_key[:16], AES.MODE_CTR, counter=counter).encrypt(private_key)
+        mac = keccak(derived_key[16:32] + ciphertext)
+
+        address = Keys.address(Keys.pubkey(private_key))
+
+        return {
+            "address": address[2:].lower(),
+            "crypto": {
+                "cipher": "aes-128-ctr",
+                "ciphertext": ciphertext.hex(),
+                "cipherparams": {"iv": iv.hex()},
+                "kdf": "scrypt",
+                "kdfparams": {"dklen": 32, "n": n, "p": p, "r": r, "salt": salt.hex()},
+                "mac": mac.hex()
+            },
+            "id": str(uuid.uuid4()),
+            "version": 3
+        }
+
+    @classmethod
+    def filename(cls, address):
+        """Returns the keystore file name geth uses for an address."""
+        now = datetime.datetime.utcnow()
+        return f"UTC--{now.strftime('%Y-%m-%dT%H-%M-%S')}.{now.microsecond * 1000:09d}Z--{address[2:].lower()}"
+
+    @classmethod
+    def create(cls, keystore_dir, passphrase, params, private_key=None):
+        """Creates a new account in given keystore directory and returns its checksummed address."""
+        if private_key is None:
+            private_key = Keys.gen_private_key()
+        keystore = cls.encrypt(private_key, passphrase, params)
+        address = Keys.address(Keys.pubkey(private_key))
+
+        os.makedirs(keystore_dir, exist_ok=True)
+        fd = os.open(os.path.join(keystore_dir, cls.filename(address)), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(keystore, f)
+
+        return address
 
 # ERRORS
 class InvalidFlagErr(Exception):
@@ -70,6 +642,18 @@ class MandatoryKeyMissingErr(Exception):
 class ShellCommandErr(Exception):
     pass
 
+class ShellTimeoutErr(ShellCommandErr):
+    pass
+
+class DockerApiErr(Exception):
+    pass
+
+class InvalidJobCountErr(Exception):
+    pass
+
+class InvalidKeystoreParamErr(Exception):
+    pass
+
 class NetworkDirExistsErr(FileExistsError):
     pass
 
@@ -130,20 +714,65 @@ class ObjNotSavableErr(Exception):
 class GoverningContractNotDeployedErr(Exception):
     pass
 
+class RpcErr(Exception):
+    pass
+
+class TransactionFailedErr(Exception):
+    pass
+
+class ContractDependencyErr(Exception):
+    pass
+
+class ContractAddressErr(Exception):
+    pass
+
+class NodeNotReadyErr(Exception):
+    pass
+
+class NodeNotFoundErr(Exception):
+    pass
+
+class NodeNotAddableErr(Exception):
+    pass
+
+class ChainSeedErr(Exception):
+    pass
+
+class SnapshotExistsErr(FileExistsError):
+    pass
+
+class SnapshotNotFoundErr(FileNotFoundError):
+    pass
+
+class InvalidSnapshotTagErr(Exception):
+    pass
+
+class GenesisBlockNotFoundErr(FileNotFoundError):
+    pass
+
 # COMMAND
 class Command():
     """Defines the working shell environment."""
     # directories
     WORKDIR = os.getcwd()
     TMPDIR = os.path.join(WORKDIR, ".tmp")
+    CACHEDIR = os.path.join(WORKDIR, ".cache")
+    SNAPSHOTDIR = os.path.join(WORKDIR, ".snapshots")
 
     # files
     LOGFILE = os.path.join(TMPDIR, "logs.txt")
     CONFFILE = os.path.join(WORKDIR, "network.yaml")
+    CONFCACHE = os.path.join(CACHEDIR, "network.yaml.json")
 
     # docker
     DOCKERDIR = os.path.join(WORKDIR, "docker")
 
+    # guards the log file, since steps may log from several worker threads
+    LOG_LOCK = threading.Lock()
+
+    # (step, seconds) of every progress step of the command run
+    TIMINGS = []
+
     # consts
     NAME = sys.argv[0]
     FLAGS = {
@@ -157,7 +786,7 @@ class Command():
         # splitting up flags for subcommands
         subcmds = [sys.argv[0]]
         for subcls in cls.__subclasses__():
-            subcmd = subcls.__name__.lower()
+            subcmd = subcls.cmd_name()
             subcmds.append(subcmd)
 
         args = {}
@@ -170,6 +799,11 @@ class Command():
 
         return args
 
+    @classmethod
+    def cmd_name(cls):
+        """Returns the name of a subcommand as used on the command line, which is the lowercase class name unless the subcommand defines 'CMD'."""
+        return getattr(cls, "CMD", cls.__name__.lower())
+
     @classmethod
     def parse_flags(cls, flgs):
         for flg in flgs:
@@ -189,7 +823,7 @@ class Command():
         # automatically fetch subcmd help strings
         cmds = "Commands\n"
         for subcls in cls.__subclasses__():
-            cmds += f"\t{subcls.__name__.lower()}\t{subcls.HELP}\n"
+            cmds += f"\t{subcls.cmd_name()}\t{subcls.HELP}\n"
         cmds += "\n"
         epilog = f"For more info on commands use:\n\t{cls.NAME} COMMAND --help\n"
         
@@ -214,16 +848,116 @@ class Command():
         """Prints an updatable progress string to stdout."""
         print(f"{Deco.INFO}[INFO]{Deco.RESET}\t{string}", end="\r")
         cls.log(f"[INFO]\t{string}")
+        start = time.monotonic()
         ret = function(*args, **kwargs)
+        # coroutine functions, e.g. concurrently awaited shell commands, are run to completion
+        if asyncio.iscoroutine(ret):
+            ret = Shell.sync(ret)
+        Command.TIMINGS.append((string, time.monotonic() - start))
         print(f"{Deco.OK}[OK]{Deco.RESET}  ")
 
         return ret
 
+    @classmethod
+    def print_step_timings(cls):
+        """Prints how long each progress step of the command run took."""
+        total = sum(seconds for _, seconds in Command.TIMINGS)
+        str = f"\n{Deco.STATUS}[TIME]{Deco.RESET}\t{total:.2f}s total"
+        for string, seconds in Command.TIMINGS:
+            str += f"\n\t{seconds:7.2f}s\t{string}"
+        print(str)
+
+    @classmethod
+    def run_parallel(cls, function, items, jobs=1):
+        """Calls function on every item with a pool of 'jobs' worker threads and returns the results in order of the given items. The first raised error is re-raised after all workers have finished."""
+        items = list(items)
+        if jobs <= 1 or len(items) <= 1:
+            return [function(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=min(jobs, len(items))) as pool:
+            futures = [pool.submit(function, item) for item in items]
+
+        rets = []
+        for future in futures:
+            rets.append(future.result())
+
+        return rets
+
+    @classmethod
+    def run_steps(cls, net, steps, jobs=1):
+        """Runs the given steps of a pipeline as soon as all of their dependencies are complete, so that independent steps run concurrently. Per-node steps run for up to 'jobs' nodes at once. Completed work is committed to the state store after every step, also if another step fails, so that a later run resumes from the first incomplete work."""
+        ran = set()
+        finished = set()
+        pending = list(steps)
+        running = {}
+        error = None
+        with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+            while pending != [] or running != {}:
+                # no new steps are started once a step has failed
+                if error is None:
+                    for step in [step for step in pending if all(dep in finished for dep in step.deps)]:
+                        pending.remove(step)
+                        # steps without a completion check are redone if work they depend on was redone
+                        redo = any(dep in ran for dep in step.deps)
+                        running[pool.submit(cls.run_step, net, step, redo, jobs)] = step
+                if running == {}:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        if future.result():
+                            ran.add(step.name)
+                        finished.add(step.name)
+                    except Exception as err:
+                        error = error or err
+                net.save()
+
+        if error is not None:
+            raise error
+
+    @classmethod
+    def run_step(cls, net, step, redo=False, jobs=1):
+        """Runs a step for all items it has not been completed for yet and returns if there was any work to do."""
+        items = step.pending(net, redo)
+        if items == []:
+            print(f"{Deco.OK}[OK]{Deco.RESET}\t{step.string} (already done)")
+            cls.log(f"[INFO]\t{step.string} (already done)")
+            return False
+
+        print(f"{Deco.INFO}[INFO]{Deco.RESET}\t{step.string}")
+        cls.log(f"[INFO]\t{step.string}")
+        start = time.monotonic()
+        if step.is_async():
+            # every item is run to its end, so that all completed work is recorded
+            Shell.sync(Shell.gather([step.run_async(net, item) for item in items], jobs=jobs, cancel=False))
+        else:
+            cls.run_parallel(lambda item: step.run(net, item), items, jobs=jobs)
+        seconds = time.monotonic() - start
+        Command.TIMINGS.append((step.string, seconds))
+        print(f"{Deco.OK}[OK]{Deco.RESET}\t{step.string} ({seconds:.2f}s)")
+
+        return True
+
+    @classmethod
+    def parse_jobs(cls, jobs):
+        """Parses the value given to a '--jobs' flag."""
+        try:
+            jobs = int(jobs)
+        except (TypeError, ValueError):
+            raise InvalidJobCountErr(f"Invalid job count '{jobs}', has to be a positive integer.")
+        if jobs < 1:
+            raise InvalidJobCountErr(f"Invalid job count '{jobs}', has to be a positive integer.")
+
+        return jobs
+
     @classmethod
     def log(cls, msg):
         """Logs a given string."""
-        with open(cls.LOGFILE, "a") as logs:
-            logs.write(msg)
+        with cls.LOG_LOCK:
+            with open(cls.LOGFILE, "a") as logs:
+                logs.write(msg)
 
     @classmethod
     def pre_exec(cls):
@@ -233,15 +967,23 @@ class Command():
             shutil.rmtree(cls.TMPDIR)
         os.mkdir(cls.TMPDIR)
 
-        # check if docker is enabled
+        # printing help does not need docker at all
+        if cls.help_requested():
+            return 0
+
+        # check if docker is enabled, the same call takes the container snapshot of this command
         try:
-            cmd = "docker network ls"
-            Shell.call(cmd, check_ret=True)
-        except ShellCommandErr as err:
+            Docker.refresh()
+        except (ShellCommandErr, DockerApiErr) as err:
             return cls.handle_err(err)
 
         return 0
 
+    @classmethod
+    def help_requested(cls):
+        """Checks if any help flag was given on the command line."""
+        return any(arg in ["help", "--help", "-h"] for arg in sys.argv[1:])
+
     @classmethod
     def post_exec(cls, ret):
         """Function called after command execution."""
@@ -289,31 +1031,71 @@ class Command():
         except Exception as err:
             return cls.handle_err(err)
 
+        ret = 1
         for cmd, flags in args.items():
             if cmd == "prepare":
-                return Prepare.exec(net, flags=flags)
+                ret = Prepare.exec(net, flags=flags)
             elif cmd == "init":
-                return Init.exec(net, flags=flags)
+                ret = Init.exec(net, flags=flags)
             elif cmd == "clean":
-                return Clean.exec(net, flags=flags)
+                ret = Clean.exec(net, flags=flags)
             elif cmd == "up":
-                return Up.exec(net, flags=flags)
+                ret = Up.exec(net, flags=flags)
             elif cmd == "down":
-                return Down.exec(net, flags=flags)
+                ret = Down.exec(net, flags=flags)
             elif cmd == "setup":
-                return Setup.exec(net, flags=flags)
+                ret = Setup.exec(net, flags=flags)
+            elif cmd == "status":
+                ret = Status.exec(net, flags=flags)
+            elif cmd == "add-node":
+                ret = AddNode.exec(net, flags=flags)
+            elif cmd == "snapshot":
+                ret = Snapshot.exec(net, flags=flags)
+            elif cmd == "restore":
+                ret = Restore.exec(net, flags=flags)
+            elif cmd == "reset-chain":
+                ret = ResetChain.exec(net, flags=flags)
+            else:
+                continue
+            break
 
-        return 1
+        # write all state changes of the command at once
+        try:
+            net.save()
+        except Exception as err:
+            return cls.handle_err(err)
+
+        return ret
 
     @classmethod
     def read_conf_file(cls, conf_file):
-        """Reads in config file from given path."""
-        # read in .yaml network config file
+        """Reads in config file from given path. The parsed config is cached as json and only parsed again when the file has changed."""
         try:
-            with open(cls.CONFFILE) as f:
-                conf_dict = yaml.full_load(f)
+            stat = os.stat(conf_file)
         except FileNotFoundError as err:
-            raise ConfigFileNotFoundErr(f"Could not find config file at '{cls.conf_file}'.")
+            raise ConfigFileNotFoundErr(f"Could not find config file at '{conf_file}'.")
+
+        # the cache is keyed by the config file's path, modification time and size
+        key = f"{os.path.abspath(conf_file)}:{stat.st_mtime_ns}:{stat.st_size}"
+        try:
+            with open(cls.CONFCACHE) as f:
+                cache = json.load(f)
+            if cache["key"] == key:
+                return cache["config"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        # read in .yaml network config file, yaml is only needed on a cache miss
+        import yaml
+        with open(conf_file) as f:
+            conf_dict = yaml.full_load(f)
+
+        # a failing cache write only costs the next run a yaml parse
+        try:
+            os.makedirs(cls.CACHEDIR, exist_ok=True)
+            State.dump(cls.CONFCACHE, {"key": key, "config": conf_dict})
+        except (OSError, WritingInfoFileErr):
+            pass
 
         return conf_dict
 
@@ -323,14 +1105,26 @@ class Prepare(Command):
     HELP = "Builds needed docker images and creates new docker network."
 
     FLAGS = {
-        "help": False
+        "help": False,
+        "jobs": 4,
+        "rebuild": False
     }
 
+    # image all node-type images are built upon
+    BASE_IMAGE = "quorum-node"
+    # directory of the node tools, which the node-type images copy from the docker directory
+    TOOLS_DIR = "tools"
+
     @classmethod
     def parse_flags(cls, flgs):
+        flgs = iter(flgs)
         for flg in flgs:
             if flg in ["help", "--help", "-h"]:
                 cls.FLAGS["help"] = True
+            elif flg in ["--jobs", "-j"]:
+                cls.FLAGS["jobs"] = cls.parse_jobs(next(flgs, None))
+            elif flg in ["--rebuild"]:
+                cls.FLAGS["rebuild"] = True
             else:
                 raise InvalidFlagErr(f"Invalid flag '{flg}' for subcommand '{cls.__name__.lower()}'")
 
@@ -340,7 +1134,7 @@ class Prepare(Command):
     def exec(cls, net, flags=[]):
         try:
             flgs = cls.parse_flags(flags)
-        except InvalidFlagErr as err:
+        except (InvalidFlagErr, InvalidJobCountErr) as err:
             return cls.handle_err(err)
 
         # check flags
@@ -350,35 +1144,95 @@ class Prepare(Command):
         
         # prepare docker network
         try:
-            cmd = f"docker network create -d {net.docker_settings.network_driver} --subnet {net.docker_settings.subnet} {net.name}"
-            # progress wrapper for Shell.call to print output
-            cls.print_progress(f"Creating docker network '{net.name}'.", Shell.call, cmd)
-        except ShellCommandErr as err:
+            cls.print_progress(f"Creating docker network '{net.name}'.", Docker.create_network, net.name, net.docker_settings.network_driver, net.docker_settings.subnet)
+        except (ShellCommandErr, DockerApiErr) as err:
             return cls.handle_err(err)
 
-        # build docker images
-        docker_images = os.listdir(cls.DOCKERDIR)
-        # TODO: make this less hacky
-        docker_images.remove("quorum-node")
-        docker_images.remove("README.md")
-        docker_images.insert(0, "quorum-node")
-        for img in docker_images:
-            try:
-                uid = os.getuid()
-                dir = os.path.join(cls.DOCKERDIR, img)
-                cmd = f"docker image build --build-arg UID={uid} --build-arg DOCKER_GETH_PORT={net.docker_settings.geth_port} --build-arg DOCKER_RPC_PORT={net.docker_settings.rpc_port} -t {img}:latest {dir}"
-                cls.print_progress(f"Building docker image '{img}'.", Shell.call, cmd, check_ret=True)
-            except Exception as err:
-                return cls.handle_err(err)
+        # build docker images, the base image first since all others depend on it
+        try:
+            cls.build_base_image(net)
+            role_images = cls.role_images()
+            cls.print_progress(f"Building docker images {', '.join(role_images)}.", Shell.gather, [cls.build_image(net, img) for img in role_images], jobs=cls.FLAGS["jobs"])
+        except Exception as err:
+            return cls.handle_err(err)
             
         return 0
 
+    @classmethod
+    def role_images(cls):
+        """Returns all node-type images, which only depend on the base image."""
+        docker_images = os.listdir(cls.DOCKERDIR)
+        docker_images.remove(cls.BASE_IMAGE)
+        docker_images.remove(cls.TOOLS_DIR)
+        docker_images.remove("README.md")
+
+        return sorted(docker_images)
+
+    @classmethod
+    def build_args(cls, net):
+        """Build args shared by all images."""
+        uid = os.getuid()
+        return f"--build-arg UID={uid} --build-arg DOCKER_GETH_PORT={net.docker_settings.geth_port} --build-arg DOCKER_RPC_PORT={net.docker_settings.rpc_port}"
+
+    @classmethod
+    async def build_image(cls, net, img, tags=["latest"], build_args=""):
+        """Builds a docker image from its directory in the docker directory. The whole docker directory is the build context, so that images can copy the shared node tools. The build output is streamed to the log file, builds have no timeout since compiling quorum takes a while."""
+        dockerfile = os.path.join(cls.DOCKERDIR, img, "Dockerfile")
+        tag_args = " ".join(f"-t {img}:{tag}" for tag in tags)
+        cmd = f"docker image build {cls.build_args(net)} {build_args} {tag_args} -f {dockerfile} {cls.DOCKERDIR}"
+        await Shell.run(cmd, check_ret=True, timeout=None, on_line=lambda line: cls.log(f"[BUILD]\t{img}: {line}\n"), capture=False)
+
+    @classmethod
+    def quorum_revision(cls, net):
+        """Returns the quorum commit the base image is built from: 'quorum-revision' from the docker settings or the checked out 'quorum' submodule. None if it is not pinned."""
+        if net.docker_settings.quorum_revision is not None:
+            return str(net.docker_settings.quorum_revision)
+
+        try:
+            cmd = f"git -C {os.path.join(cls.WORKDIR, 'quorum')} rev-parse HEAD"
+            return Shell.call(cmd, check_ret=True).strip()
+        except Exception:
+            return None
+
+    @classmethod
+    def base_image_tag(cls, net, revision):
+        """Returns the cache tag of the base image, derived from the quorum revision, its Dockerfile and the build args."""
+        sha = hashlib.sha256()
+        sha.update(revision.encode("utf-8"))
+        sha.update(cls.build_args(net).encode("utf-8"))
+        with open(os.path.join(cls.DOCKERDIR, cls.BASE_IMAGE, "Dockerfile"), "rb") as f:
+            sha.update(f.read())
+
+        return sha.hexdigest()[:12]
+
+    @classmethod
+    def image_exists(cls, image):
+        """Checks if a docker image with given name and tag exists."""
+        return Docker.image_exists(image)
+
+    @classmethod
+    def build_base_image(cls, net):
+        """Builds the base image from a pinned quorum revision. If an image of the same revision and build settings exists, it is reused instead of rebuilding quorum."""
+        revision = cls.quorum_revision(net)
+        if revision is None:
+            # nothing to cache against, quorum's default branch is built
+            cls.print_progress(f"Building docker image '{cls.BASE_IMAGE}'.", cls.build_image, net, cls.BASE_IMAGE)
+            return
+
+        tag = cls.base_image_tag(net, revision)
+        if not cls.FLAGS["rebuild"] and cls.image_exists(f"{cls.BASE_IMAGE}:{tag}"):
+            cls.print_progress(f"Using cached docker image '{cls.BASE_IMAGE}' (quorum {revision[:12]}).", Docker.tag_image, f"{cls.BASE_IMAGE}:{tag}", cls.BASE_IMAGE, "latest")
+        else:
+            cls.print_progress(f"Building docker image '{cls.BASE_IMAGE}' (quorum {revision[:12]}).", cls.build_image, net, cls.BASE_IMAGE, tags=["latest", tag], build_args=f"--build-arg QUORUM_REVISION={revision}")
+
     @classmethod
     def helpstr(cls):
         cmd = cls.__name__.lower()
         usage = f"Usage like:\n\t{Command.NAME} {cmd} [FLAGS]\n"
         flgs = (
             "Flags\n"
+            "\t-j, --jobs N\tBuilds up to N node-type images concurrently (default: 4).\n"
+            "\t--rebuild\tRebuilds the base image even if one of the same quorum revision exists.\n"
             "\t-h, --help\tPrints help and exits.\n"
         )
         helpstr = usage + "\n" + cls.HELP + "\n" + "\n" + flgs + "\n"
@@ -392,9 +1246,13 @@ class Init(Command):
         
     FLAGS = {
         "reset": False,
-        "help": False
+        "help": False,
+        "jobs": 1
     }
 
+    # process pool for key derivation, only present during a command run with more than one job
+    PROCESS_POOL = None
+
     @classmethod
     def helpstr(cls):
         cmd = cls.__name__.lower()
@@ -402,6 +1260,7 @@ class Init(Command):
         flgs = (
             "Flags\n"
             "\t-r, --reset\tCleans the network (directory) before initialization.\n"
+            "\t-j, --jobs N\tRuns per-node operations with N parallel workers (default: 1).\n"
             "\t-h, --help\tPrints help and exits.\n"
         )
         helpstr = usage + "\n" + cls.HELP + "\n" + "\n" + flgs + "\n"
@@ -410,11 +1269,14 @@ class Init(Command):
 
     @classmethod
     def parse_flags(cls, flgs):
+        flgs = iter(flgs)
         for flg in flgs:
             if flg in ["help", "--help", "-h"]:
                 cls.FLAGS["help"] = True
             elif flg in ["--reset", "-r"]:
                 cls.FLAGS["reset"] = True
+            elif flg in ["--jobs", "-j"]:
+                cls.FLAGS["jobs"] = cls.parse_jobs(next(flgs, None))
             else:
                 raise InvalidFlagErr(f"Invalid flag '{flg}' for subcommand '{cls.__name__.lower()}'")
 
@@ -424,7 +1286,7 @@ class Init(Command):
     def exec(cls, net, flags=[]):
         try:
             flgs = cls.parse_flags(flags)
-        except InvalidFlagErr as err:
+        except (InvalidFlagErr, InvalidJobCountErr) as err:
             return cls.handle_err(err)
 
         # check flags
@@ -433,24 +1295,38 @@ class Init(Command):
             return 0
         if flgs["reset"]:
             Clean.exec(net)
-        
+
+        # the init pipeline, every step is only run for the nodes it has not been completed for yet
+        steps = [
+            Step("dirs", "Generating file hierarchy.", cls.gen_dir_structure, check=cls.has_dir_structure),
+            Step("validators", "Setting up IBFT validator nodes.", cls.setup_validator, deps=["dirs"], nodes=lambda net: net.validators, check=lambda val: val.has_nodekey() and val.enode is not None),
+            Step("non-validators", "Setting up non-validator nodes.", cls.setup_non_validator, deps=["dirs"], nodes=lambda net: [node for node in net.nodes if node.type != "validator"], check=lambda node: node.has_nodekey() and node.enode is not None),
+            Step("accounts", "Creating geth accounts.", cls.create_accounts, deps=["dirs"], nodes=lambda net: [node for node in net.nodes if node.accs is not None], check=lambda node: node.has_accs()),
+            Step("genesis", "Composing genesis block.", cls.compose_genesis, deps=["validators", "accounts"], check=cls.has_genesis),
+            Step("static-nodes", "Setting up node discovery.", cls.setup_static_nodes, deps=["validators", "non-validators"]),
+            Step("geth-init", "Initializing geth on all nodes.", cls.geth_init, deps=["genesis"], nodes=lambda net: net.nodes, check=lambda node: node.is_init())
+        ]
         try:
-            cls.print_progress("Generating file hierarchy.", cls.gen_dir_structure, net)
-            cls.print_progress("Setting up IBFT validator nodes.", cls.setup_validators, net)
-            cls.print_progress("Forming validator consortium.", cls.form_consortium, net)
-            cls.print_progress("Creating geth accounts.", cls.create_accounts, net)
-            cls.print_progress("Pre-allocating funds.", cls.pre_alloc_funds, net)
-            cls.print_progress("Setting up non-validator nodes.", cls.setup_non_validators, net)
-            cls.print_progress("Setting up node discovery.", cls.setup_static_nodes, net)
-            cls.print_progress("Initializing geth on all nodes.", cls.geth_init, net)
+            # key derivation is CPU-bound, so keystores are written by a pool of processes
+            if flgs["jobs"] > 1:
+                cls.PROCESS_POOL = ProcessPoolExecutor(max_workers=flgs["jobs"])
+            try:
+                cls.run_steps(net, steps, jobs=flgs["jobs"])
+            finally:
+                if cls.PROCESS_POOL is not None:
+                    cls.PROCESS_POOL.shutdown()
+                    cls.PROCESS_POOL = None
 
         except Exception as err:
             return cls.handle_err(err)
 
+        return 0
+
     @classmethod
     def gen_dir_structure(cls, net):
         """Generates working directories for the nodes."""
-        net.create_dir()
+        if not os.path.isdir(net.dir):
+            net.create_dir()
         for node in net.nodes:
             node.create_dir()
 
@@ -458,26 +1334,60 @@ class Init(Command):
             c.create_dir()
 
     @classmethod
-    def setup_validators(cls, net):
-        """Create istanbul bft compatible genesis block and according-static nodes file."""
-        for val in net.validators:
-            # calling 'istanbul setup ...' on validators
-            val.setup()
+    def has_dir_structure(cls, net):
+        """Checks if the working directories of the network, all nodes and contracts exist."""
+        dirs = [net.dir] + [node.geth_dir for node in net.nodes] + [c.dir for c in net.contracts]
+
+        return all(os.path.isdir(dir) for dir in dirs)
 
     @classmethod
-    def setup_non_validators(cls, net):
-        """Copies genesis block from main validator to all other nodes."""
-        val = net.validators[0]
-        val_genesis = os.path.join(val.dir, "genesis.json")
-        for node in net.nodes:
-            if node.type != "validator":
-                node.setup(val_genesis)
+    async def setup_validator(cls, net, val):
+        """Calls 'istanbul setup ...' on a validator to create its nodekey."""
+        await val.setup_async()
+
+    @classmethod
+    def setup_non_validator(cls, net, node):
+        """Sets up nodekey and enode of a non-validator node."""
+        node.setup()
+
+    @classmethod
+    def has_genesis(cls, net):
+        """Checks if the genesis block is written and was composed from the current validator keys. Validators that were set up again have new keys, which the consortium in the genesis' extraData has to be formed from anew."""
+        if any(val.node_addr is None for val in net.validators):
+            return False
+        try:
+            with open(net.genesis.path, "r") as f:
+                extra_data = json.load(f)["extraData"]
+        except (OSError, ValueError, KeyError):
+            return False
+
+        return extra_data == Validator.form_consortium(net.validators)
+
+    @classmethod
+    def compose_genesis(cls, net):
+        """Composes the genesis block from the validators and accounts and writes it. Once written, the genesis block is only composed again if the validator keys changed, since it defines the chain."""
+        # chains initialized from an outdated genesis block could never seal a block, they are initialized again
+        if os.path.isfile(net.genesis.path):
+            for node in net.nodes:
+                if node.is_init():
+                    node.reset_chain()
+
+        cls.form_consortium(net)
+        cls.pre_alloc_funds(net)
+        cls.create_account_pools(net)
+        cls.write_genesis(net)
 
     @classmethod
     def form_consortium(cls, net):
-        """Forms a constortium of validators at genesis block by adding all validators to each validator's genesis block."""
-        for val in net.validators:
-            val.form_consortium(net.validators)
+        """Forms a constortium of validators at genesis block by adding all validators to the network's genesis block."""
+        # the genesis created by 'istanbul setup ...' on the main validator serves as template
+        net.genesis.load(os.path.join(net.validators[0].dir, "genesis.json"))
+        net.genesis.extra_data = Validator.form_consortium(net.validators)
+
+    @classmethod
+    def write_genesis(cls, net):
+        """Writes the composed genesis block once to the network directory."""
+        net.genesis.write()
 
     @classmethod
     def setup_validator_discovery(cls, net):
@@ -493,39 +1403,53 @@ class Init(Command):
             node.set_static_nodes(static_nodes)
 
     @classmethod
-    def create_accounts(cls, net):
-        """Creates geth accounts for all nodes that have specified one."""
-        for node in net.nodes:
-            node.create_accs()
+    def create_accounts(cls, net, node):
+        """Creates the geth accounts of a node. With more than one job, the keystores are written by the process pool of the command run."""
+        params = Keystore.params(net.keystore)
+        if cls.PROCESS_POOL is None:
+            node.create_accs(params)
+            return
+
+        futures = [(name, acc, cls.PROCESS_POOL.submit(Keystore.create, Account.keystore_dir(node.dir), acc.passphrase, params)) for name, acc in node.accs.items()]
+        acc_addrs = {}
+        for name, acc, future in futures:
+            acc.addr = future.result()
+            acc_addrs[name] = acc.addr
+        node.acc_addrs = acc_addrs
+        node.save()
 
     @classmethod
     def pre_alloc_funds(cls, net):
-        """Checks if some node wants to have a pre-allocated balance and adds it then to all validators' genesis block."""
+        """Checks if some node wants to have a pre-allocated balance and adds it then to the network's genesis block."""
         for node in net.nodes:
             if node.accs is not None:
                 for _, acc in node.accs.items():
                     if acc.balance is not None:
-                        for val in net.validators:
-                            # modifying validator's genesis
-                            val.pre_alloc_funds(acc.addr, acc.balance)
+                        net.genesis.alloc(acc.addr, acc.balance)
 
     @classmethod
-    def geth_init(cls, net):
-        """Calling 'geth init ...' on all nodes."""
-        for node in net.nodes:
-            node.init()
+    def create_account_pools(cls, net):
+        """Derives the keys of all account pools, writes their keys files and pre-allocates their balances in the network's genesis block."""
+        for pool in net.account_pools:
+            for addr in pool.create(executor=cls.PROCESS_POOL):
+                net.genesis.alloc(addr, pool.balance)
+
+    @classmethod
+    async def geth_init(cls, net, node):
+        """Links the network's genesis block to a node and calls 'geth init ...' on it."""
+        net.genesis.link_to(node.dir)
+        await node.init_async()
 
     @classmethod
     def write_contracts_to_genesis(cls, net):
         """Adds all contracts specified in config file to genesis block."""
         for c in net.contracts:
-            c.write_to_genesis(net.validators)
+            c.write_to_genesis(net.genesis)
 
     @classmethod
     def compile_contracts(cls, net):
-        """Compiles contracts into network directory, to be able to write the bytecode to genesis block later."""
-        for c in net.contracts:
-            c.compile(runtime=True)
+        """Compiles contracts, to be able to write the runtime bytecode to genesis block later."""
+        Contract.compile_all(net.contracts)
 
 class Clean(Command):
     """Shuts down all nodes, deletes the network directory and cleans up afterwards."""
@@ -595,6 +1519,7 @@ class Clean(Command):
 
     @classmethod
     def delete_network_dir(cls, net):
+        net.state.reset()
         try:
             shutil.rmtree(net.dir)
         except FileNotFoundError:
@@ -602,16 +1527,20 @@ class Clean(Command):
     
     @classmethod
     def delete_docker_imgs(cls, net):
-        docker_images = os.listdir(cls.DOCKERDIR)
-        docker_images.remove("README.md")
+        docker_images = [Prepare.BASE_IMAGE] + Prepare.role_images()
         for img in docker_images:
-            cmd = f"docker image rm {img}"
-            cls.print_progress(f"Deleting docker image '{img}'.", Shell.call, cmd, check_ret=True)
+            cls.print_progress(f"Deleting docker image '{img}'.", Docker.remove_image, img)
+
+        # also remove the cached base image of the current quorum revision
+        revision = Prepare.quorum_revision(net)
+        if revision is not None:
+            image = f"{Prepare.BASE_IMAGE}:{Prepare.base_image_tag(net, revision)}"
+            if Prepare.image_exists(image):
+                cls.print_progress(f"Deleting docker image '{image}'.", Docker.remove_image, image)
 
     @classmethod
     def delete_docker_network(cls, net):
-        cmd = f"docker network rm {net.name}"
-        Shell.call(cmd, check_ret=True)
+        Docker.remove_network(net.name)
 
 class Up(Command):
     """Boots up all network nodes defined in config file. All nodes are booted in docker containers."""
@@ -620,6 +1549,9 @@ class Up(Command):
 
     FLAGS = {
         "help": False,
+        "jobs": 8,
+        "wait": False,
+        "timeout": 120
     }
 
     @classmethod
@@ -628,6 +1560,9 @@ class Up(Command):
         usage = f"Usage like:\n\t{Command.NAME} {cmd} [FLAGS]\n"
         flgs = (
             "Flags\n"
+            "\t-j, --jobs N\tBoots up to N nodes concurrently (default: 8).\n"
+            "\t-w, --wait\tBlocks until every node's RPC answers and validators produce blocks.\n"
+            "\t-t, --timeout S\tGives up waiting for the nodes after S seconds (default: 120).\n"
             "\t-h, --help\tPrints help and exits.\n"
         )
         helpstr = usage + "\n" + cls.HELP + "\n" + "\n" + flgs + "\n"
@@ -636,9 +1571,20 @@ class Up(Command):
 
     @classmethod
     def parse_flags(cls, flgs):
+        flgs = iter(flgs)
         for flg in flgs:
             if flg in ["help", "--help", "-h"]:
                 cls.FLAGS["help"] = True
+            elif flg in ["--jobs", "-j"]:
+                cls.FLAGS["jobs"] = cls.parse_jobs(next(flgs, None))
+            elif flg in ["--wait", "-w"]:
+                cls.FLAGS["wait"] = True
+            elif flg in ["--timeout", "-t"]:
+                timeout = next(flgs, None)
+                try:
+                    cls.FLAGS["timeout"] = float(timeout)
+                except (TypeError, ValueError):
+                    raise InvalidFlagErr(f"Invalid timeout '{timeout}' for subcommand '{cls.__name__.lower()}'")
             else:
                 raise InvalidFlagErr(f"Invalid flag '{flg}' for subcommand '{cls.__name__.lower()}'")
 
@@ -648,7 +1594,7 @@ class Up(Command):
     def exec(cls, net, flags=[]):
         try:
             flgs = cls.parse_flags(flags)
-        except InvalidFlagErr as err:
+        except (InvalidFlagErr, InvalidJobCountErr) as err:
             return cls.handle_err(err)
 
         # check flags
@@ -657,21 +1603,54 @@ class Up(Command):
             return 0
         
         try:
-            cls.boot_up_nodes(net)
+            timings = cls.boot_up_nodes(net)
+            if flgs["wait"]:
+                cls.print_progress("Waiting for nodes to become ready.", cls.wait_for_nodes, net, timings)
+                cls.print_timings(net, timings)
         except Exception as err:
-            cls.handle_err(err)
+            return cls.handle_err(err)
 
         return 0
 
     @classmethod
     def boot_up_nodes(cls, net):
-        """Boots up all given nodes in docker containers with node.name as container name."""
-        for node in net.nodes:
-            cls.print_progress(f"Booting up node '{node.name}'.", node.up, net)
+        """Boots up all given nodes in docker containers with node.name as container name. Returns the point in time each node was booted."""
+        start = time.monotonic()
+        timings = {node.name: {"start": start} for node in net.nodes}
+
+        async def boot(node):
+            await node.up_async(net)
+            timings[node.name]["boot"] = time.monotonic() - start
+
+        cls.print_progress(f"Booting up {len(net.nodes)} nodes.", Shell.gather, [boot(node) for node in net.nodes], jobs=cls.FLAGS["jobs"])
         
         for node in net.nodes:
             node.print_status()
 
+        return timings
+
+    @classmethod
+    def wait_for_nodes(cls, net, timings):
+        """Waits until all nodes answer RPC requests and validators produce blocks."""
+        deadline = time.monotonic() + cls.FLAGS["timeout"]
+
+        def wait(node):
+            timings[node.name].update(node.wait_until_ready(deadline, timings[node.name]["start"]))
+
+        # probes are cheap, so all nodes are probed at once
+        cls.run_parallel(wait, net.nodes, jobs=len(net.nodes))
+
+    @classmethod
+    def print_timings(cls, net, timings):
+        """Prints how long each node took to boot and become ready."""
+        str = f"\n{Deco.STATUS}[TIME]{Deco.RESET}\tnode readiness (seconds since 'up')"
+        for node in net.nodes:
+            timing = timings[node.name]
+            str += f"\n\t{node.name}\tboot: {timing['boot']:.2f}\trpc: {timing['rpc']:.2f}"
+            if "block" in timing:
+                str += f"\tblock: {timing['block']:.2f}"
+        print(str)
+
 class Setup(Command):
     """Sets up the network when it is running. Builds and deploys smart contracts specified in config file."""
 
@@ -681,6 +1660,18 @@ class Setup(Command):
         "help": False
     }
 
+    # contracts whose constructor needs the address of other contracts
+    DEPENDENCIES = {
+        "CBDC": ["Governing"],
+        "CCBDC": ["Governing"]
+    }
+
+    # contracts that are set up with the address of their partner contract after deployment
+    SETUP_PARTNERS = {
+        "CBDC": "CCBDC",
+        "CCBDC": "CBDC"
+    }
+
     @classmethod
     def helpstr(cls):
         cmd = cls.__name__.lower()
@@ -718,40 +1709,74 @@ class Setup(Command):
         try:
             cls.compile_contracts(net)
             cls.deploy_contracts(net)
-            cls.contract_setup(net)
             cls.print_progress("Copying contract info to nodes.", cls.copy_contract_info, net)
             # printing contract address to stdout
             for contract in net.contracts:
                 contract.print_status()
+            cls.print_step_timings()
         except Exception as err:
             cls.handle_err(err)
 
     @classmethod
     def compile_contracts(cls, net):
         """Compiles contracts given in network config file."""
-        for c in net.contracts:
-            cls.print_progress(f"Compiling contract '{c.name}'.", c.compile)
+        cls.print_progress(f"Compiling {len(net.contracts)} contracts.", Contract.compile_all, net.contracts)
 
     @classmethod
-    def deploy_contracts(cls, net):
-        """Deploys contracts given in network config file to the network."""
+    def lead_maintainer(cls, net):
+        """Returns the maintainer that deploys and sets up contracts."""
         if net.maintainers is not None and net.maintainers != []:
-            lead_maintainer = net.maintainers[0]
-            for contract in net.contracts:
-                # create args for constructor of special contracts that depend on each other such as Governing.sol
-                args = []
-                if contract.name == "Governing":
-                    args = cls.governing_contract_args(net)
-                elif contract.name == "CBDC":
-                    args = cls.cbdc_contract_args(net)
-                elif contract.name == "CCBDC":
-                    args = cls.ccbdc_contract_args(net)
-
-                cls.print_progress(f"Deploying contract '{contract.name}'.", lead_maintainer.deploy_contract, contract, *args)
-
+            return net.maintainers[0]
         else:
             raise NoMaintainerPresentErr(f"There is no maintainer configured in the network's config file, ergo you cannot deploy smart contracts.")
 
+    @classmethod
+    def deployment_plan(cls, net):
+        """Orders the contracts into layers by their dependencies. All contracts of a layer only depend on contracts of earlier layers, which are therefore deployed at lower nonces."""
+        names = [c.name for c in net.contracts]
+        deps = {c.name: [d for d in cls.DEPENDENCIES.get(c.name, []) if d in names] for c in net.contracts}
+
+        layers = []
+        deployed = set()
+        remaining = list(net.contracts)
+        while remaining != []:
+            layer = [c for c in remaining if all(d in deployed for d in deps[c.name])]
+            if layer == []:
+                raise ContractDependencyErr(f"Contracts {[c.name for c in remaining]} depend on each other, ergo they cannot be deployed.")
+            layers.append(layer)
+            deployed.update(c.name for c in layer)
+            remaining = [c for c in remaining if c not in layer]
+
+        return layers
+
+    @classmethod
+    def contract_args(cls, net, contract):
+        """Creates args for constructor of special contracts that depend on each other such as Governing.sol."""
+        if contract.name == "Governing":
+            return cls.governing_contract_args(net)
+        elif contract.name == "CBDC":
+            return cls.cbdc_contract_args(net)
+        elif contract.name == "CCBDC":
+            return cls.ccbdc_contract_args(net)
+
+        return []
+
+    @classmethod
+    def deploy_contracts(cls, net):
+        """Deploys and sets up contracts given in network config file to the network. The contract addresses follow from the lead maintainer's address and nonces, so that all deploy and setup transactions are sent together and usually take a single block."""
+        lead_maintainer = cls.lead_maintainer(net)
+        contracts = [c for layer in cls.deployment_plan(net) for c in layer]
+
+        # constructor and setup args contain the addresses of other contracts, which are calculated ahead of their deployment
+        nonce = lead_maintainer.next_nonce()
+        for i, c in enumerate(contracts):
+            c.addr = Maintainer.contract_addr(lead_maintainer.session().addr, nonce + i)
+        deployments = [(c, cls.contract_args(net, c)) for c in contracts]
+        setups = cls.contract_setups(net)
+
+        names = ", ".join(f"'{c.name}'" for c in contracts)
+        cls.print_progress(f"Deploying and setting up contracts {names}.", lead_maintainer.deploy_contracts, deployments, setups=setups, nonce=nonce)
+
     @classmethod
     def governing_contract_args(cls, net):
         """Arguments for the governing contract."""
@@ -788,79 +1813,576 @@ class Setup(Command):
                 token_supply.append(b.token_supply)
                 bankers.append(b.acc_addrs["main"])
 
-        args.append(bankers)
-        args.append(token_supply)
+        args.append(bankers)
+        args.append(token_supply)
+
+        return args
+
+    @classmethod
+    def ccbdc_contract_args(cls, net):
+        """Arguments for the CBDC contract."""
+        # get governing contract address for CBDC contract since it is needed
+        addr = None
+        for c in net.contracts:
+            if c.name == "Governing":
+                addr = c.addr
+                break
+
+        return [addr]
+
+    @classmethod
+    def contract_setups(cls, net):
+        """Returns the (contract, partner address) pairs whose setup functions have to be called to fully set the contracts up."""
+        contracts = {c.name: c for c in net.contracts}
+
+        setups = []
+        for name, partner in cls.SETUP_PARTNERS.items():
+            if name in contracts and partner in contracts:
+                setups.append((contracts[name], contracts[partner].addr))
+
+        return setups
+
+    @classmethod
+    def copy_contract_info(cls, net):
+        """Copies contract interaction tools to nodes."""
+        for c in net.contracts:
+            for node in net.nodes:
+                c.copy_info_to(node.dir)
+
+class Down(Command):
+    """Shuts down all docker containers created from config file."""
+    HELP = "Stops and shuts down every node's docker container."
+
+    FLAGS = {
+        "help": False,
+        "jobs": 8
+    }
+
+    @classmethod
+    def helpstr(cls):
+        cmd = cls.__name__.lower()
+        usage = f"Usage like:\n\t{Command.NAME} {cmd} [FLAGS]\n"
+        flgs = (
+            "Flags\n"
+            "\t-j, --jobs N\tShuts down up to N nodes concurrently (default: 8).\n"
+            "\t-h, --help\tPrints help and exits.\n"
+        )
+        helpstr = usage + "\n" + cls.HELP + "\n" + "\n" + flgs + "\n"
+
+        return helpstr
+
+    @classmethod
+    def parse_flags(cls, flgs):
+        flgs = iter(flgs)
+        for flg in flgs:
+            if flg in ["help", "--help", "-h"]:
+                cls.FLAGS["help"] = True
+            elif flg in ["--jobs", "-j"]:
+                cls.FLAGS["jobs"] = cls.parse_jobs(next(flgs, None))
+            else:
+                raise InvalidFlagErr(f"Invalid flag '{flg}' for subcommand '{cls.__name__.lower()}'")
+
+        return cls.FLAGS
+
+    @classmethod
+    def exec(cls, net, flags=[]):
+        try:
+            flgs = cls.parse_flags(flags)
+        except (InvalidFlagErr, InvalidJobCountErr) as err:
+            return cls.handle_err(err)
+
+        # check flags
+        if flgs["help"]:
+            print(cls.helpstr())
+            return 0
+        
+        try:
+            cls.shut_down_nodes(net)
+        except Exception as err:
+            cls.handle_err(err)
+
+        return 0
+
+    @classmethod
+    def shut_down_nodes(cls, net):
+        """Shuts down all running nodes' docker containers concurrently."""
+        running = [node for node in net.nodes if node.is_running()]
+        if running != []:
+            since = time.time()
+            cls.print_progress(f"Shutting down {len(running)} nodes.", cls.run_parallel, lambda node: node.down(), running, jobs=cls.FLAGS["jobs"])
+            # containers are removed after they stopped, their names are only free again afterwards
+            Docker.wait_removed([node.name for node in running], since)
+
+class Status(Command):
+    """Prints the status of the network's nodes."""
+    HELP = "Prints the status of every node or of the given nodes."
+
+    FLAGS = {
+        "help": False,
+        "nodes": []
+    }
+
+    @classmethod
+    def helpstr(cls):
+        cmd = cls.__name__.lower()
+        usage = f"Usage like:\n\t{Command.NAME} {cmd} [FLAGS] [NODE ...]\n"
+        flgs = (
+            "Flags\n"
+            "\t-h, --help\tPrints help and exits.\n"
+        )
+        helpstr = usage + "\n" + cls.HELP + "\n" + "\n" + flgs + "\n"
+
+        return helpstr
+
+    @classmethod
+    def parse_flags(cls, flgs):
+        for flg in flgs:
+            if flg in ["help", "--help", "-h"]:
+                cls.FLAGS["help"] = True
+            elif flg.startswith("-"):
+                raise InvalidFlagErr(f"Invalid flag '{flg}' for subcommand '{cls.__name__.lower()}'")
+            else:
+                cls.FLAGS["nodes"].append(flg)
+
+        return cls.FLAGS
+
+    @classmethod
+    def exec(cls, net, flags=[]):
+        try:
+            flgs = cls.parse_flags(flags)
+        except InvalidFlagErr as err:
+            return cls.handle_err(err)
+
+        # check flags
+        if flgs["help"]:
+            print(cls.helpstr())
+            return 0
+
+        # statuses are read from the state store and the docker snapshot taken before execution
+        nodes = net.nodes
+        if flgs["nodes"] != []:
+            names = [node.name for node in nodes]
+            for name in flgs["nodes"]:
+                if name not in names:
+                    return cls.handle_err(NodeNotFoundErr(f"Node '{name}' is not part of network '{net.name}'."))
+            nodes = [node for node in nodes if node.name in flgs["nodes"]]
+
+        for node in nodes:
+            node.print_status()
+
+        return 0
+
+class AddNode(Command):
+    """Adds nodes from the config file to the running network, without initializing the network again."""
+    HELP = "Adds the given nodes from the config file to the running network."
+
+    CMD = "add-node"
+
+    FLAGS = {
+        "help": False,
+        "seed_from": None,
+        "nodes": []
+    }
+
+    # seconds a seeded node has to answer RPC requests after booting
+    READY_TIMEOUT = 120
+
+    @classmethod
+    def helpstr(cls):
+        cmd = cls.cmd_name()
+        usage = f"Usage like:\n\t{Command.NAME} {cmd} [FLAGS] NODE [NODE ...]\n"
+        flgs = (
+            "Flags\n"
+            "\t-s, --seed-from PEER\tCopies the chaindata of the stopped node PEER instead of syncing from genesis.\n"
+            "\t-h, --help\t\tPrints help and exits.\n"
+        )
+        helpstr = usage + "\n" + cls.HELP + " The nodes have to be added to the config file first." + "\n" + "\n" + flgs + "\n"
+
+        return helpstr
+
+    @classmethod
+    def parse_flags(cls, flgs):
+        flgs = iter(flgs)
+        for flg in flgs:
+            if flg in ["help", "--help", "-h"]:
+                cls.FLAGS["help"] = True
+            elif flg in ["--seed-from", "-s"]:
+                cls.FLAGS["seed_from"] = next(flgs, None)
+                if cls.FLAGS["seed_from"] is None:
+                    raise InvalidFlagErr(f"Flag '{flg}' needs the name of the node to seed from.")
+            elif flg.startswith("-"):
+                raise InvalidFlagErr(f"Invalid flag '{flg}' for subcommand '{cls.cmd_name()}'")
+            else:
+                cls.FLAGS["nodes"].append(flg)
+
+        return cls.FLAGS
+
+    @classmethod
+    def exec(cls, net, flags=[]):
+        try:
+            flgs = cls.parse_flags(flags)
+        except InvalidFlagErr as err:
+            return cls.handle_err(err)
+
+        # check flags
+        if flgs["help"]:
+            print(cls.helpstr())
+            return 0
+
+        try:
+            nodes = cls.nodes_to_add(net, flgs["nodes"])
+            governing = cls.governing_contract(net)
+            seeded = cls.nodes_to_seed(net, nodes, flgs["seed_from"])
+
+            # adding the nodes is resumable like 'init', every step is only run for the nodes it has not been completed for yet
+            steps = [
+                Step("dirs", "Generating node directories.", cls.create_dir, nodes=lambda net: nodes, check=lambda node: os.path.isdir(node.geth_dir)),
+                Step("non-validators", "Setting up node keys.", Init.setup_non_validator, deps=["dirs"], nodes=lambda net: nodes, check=lambda node: node.has_nodekey() and node.enode is not None),
+                Step("accounts", "Creating geth accounts.", Init.create_accounts, deps=["dirs"], nodes=lambda net: nodes, check=lambda node: node.has_accs()),
+                Step("seed", "Seeding chaindata from a peer.", cls.seed_chaindata, deps=["dirs"], nodes=lambda net: seeded, check=lambda node: node.is_init()),
+                Step("geth-init", "Initializing geth.", Init.geth_init, deps=["seed"], nodes=lambda net: nodes, check=lambda node: node.is_init()),
+                Step("static-nodes", "Setting up node discovery.", cls.set_static_nodes, deps=["non-validators"], nodes=lambda net: nodes),
+                Step("contract-info", "Copying contract info to nodes.", cls.copy_contract_info, deps=["dirs"], nodes=lambda net: nodes),
+                Step("up", "Booting up nodes.", cls.boot_up_node, deps=["accounts", "geth-init", "static-nodes", "contract-info"], nodes=lambda net: nodes, check=lambda node: node.is_running()),
+                Step("verify", "Verifying head blocks of seeded nodes.", cls.verify_head_block, deps=["up"], nodes=lambda net: seeded),
+                Step("peers", "Adding nodes as peers to running nodes.", cls.add_to_peers, deps=["up"], nodes=lambda net: nodes),
+                Step("proposal", "Proposing nodes to the Governing contract.", cls.make_proposal, deps=["accounts"], nodes=lambda net: [node for node in nodes if governing is not None and node.type in Governor.GOVERNED_TYPES])
+            ]
+            if governing is None:
+                print(f"{Deco.INFO}[INFO]{Deco.RESET}\tContract 'Governing' is not deployed yet, the nodes are part of it once it is deployed by 'setup'.")
+
+            cls.run_steps(net, steps, jobs=len(nodes))
+            for node in nodes:
+                node.print_status()
+        except Exception as err:
+            return cls.handle_err(err)
+
+        return 0
+
+    @classmethod
+    def nodes_to_add(cls, net, names):
+        """Returns the nodes of the given names, which have to be non-validator nodes of an initialized network."""
+        if names == []:
+            raise NodeNotFoundErr(f"No node given, use '{Command.NAME} {cls.cmd_name()} NODE' to add a node.")
+        if not os.path.isfile(net.genesis.path):
+            raise NetworkDirDoesNotExistErr(f"No genesis block found at '{net.genesis.path}'. Is the network initialized?")
+
+        nodes = {node.name: node for node in net.nodes}
+        for name in names:
+            if name not in nodes.keys():
+                raise NodeNotFoundErr(f"Node '{name}' is not part of network '{net.name}'. Please add it to the config file first.")
+            if nodes[name].type == "validator":
+                raise NodeNotAddableErr(f"Node '{name}' is a validator, validators can only be added to the consortium by voting with the running validators.")
+
+        return [nodes[name] for name in names]
+
+    @classmethod
+    def nodes_to_seed(cls, net, nodes, peer_name):
+        """Returns the nodes to seed from the given peer, which are all nodes to add if a peer is given."""
+        if peer_name is None:
+            return []
+
+        peers = [node for node in net.nodes if node.name == peer_name]
+        if peers == []:
+            raise NodeNotFoundErr(f"Node '{peer_name}' to seed from is not part of network '{net.name}'.")
+        if peers[0] in nodes:
+            raise NodeNotAddableErr(f"Node '{peer_name}' cannot be seeded from itself.")
+
+        return nodes
+
+    @classmethod
+    def governing_contract(cls, net):
+        """Returns the Governing contract if it is deployed, otherwise None."""
+        for c in net.contracts:
+            if c.name == "Governing" and c.addr is not None:
+                return c
+
+        return None
+
+    @classmethod
+    def create_dir(cls, net, node):
+        """Creates the working directory of a node."""
+        node.create_dir()
+
+    @classmethod
+    def seed_chaindata(cls, net, node):
+        """Copies the chaindata of the peer given with '--seed-from' to a node and links the network's genesis block to it. 'geth init' is not needed afterwards."""
+        peer = [n for n in net.nodes if n.name == cls.FLAGS["seed_from"]][0]
+        node.seed(peer)
+        net.genesis.link_to(node.dir)
+
+    @classmethod
+    def verify_head_block(cls, net, node):
+        """Verifies that a seeded node's head block is not the genesis block and that it is part of the running network's chain."""
+        start = time.monotonic()
+        node.wait_until_ready(start + cls.READY_TIMEOUT, start)
+
+        number, hash = node.head_block()
+        if number == 0:
+            raise ChainSeedErr(f"Seeded node '{node.name}' is still at the genesis block.")
+
+        # the head is compared with a running node of the network that is not added right now
+        refs = [n for n in net.nodes if n.name not in cls.FLAGS["nodes"] and n.is_running()]
+        if refs != [] and refs[0].block_hash(number) != hash:
+            raise ChainSeedErr(f"Head block '{number}' of seeded node '{node.name}' is not part of the chain of node '{refs[0].name}'.")
+
+        print(f"{Deco.INFO}[INFO]{Deco.RESET}\tNode '{node.name}' was seeded up to block '{number}'.")
+
+    @classmethod
+    def set_static_nodes(cls, net, node):
+        """Writes the enodes of all set up nodes to a node's 'static-nodes.json', so that it dials them on every boot."""
+        static_nodes = [n.enode for n in net.nodes if n.enode is not None]
+        node.set_static_nodes(static_nodes)
+
+    @classmethod
+    def copy_contract_info(cls, net, node):
+        """Copies the info of all deployed contracts to a node."""
+        for c in net.contracts:
+            if c.addr is not None:
+                c.copy_info_to(node.dir)
+
+    @classmethod
+    async def boot_up_node(cls, net, node):
+        """Boots up a node in its docker container."""
+        await node.up_async(net)
+
+    @classmethod
+    def add_to_peers(cls, net, node):
+        """Pushes a node's enode to all other running nodes, so that the static nodes of the running network do not have to be rewritten."""
+        peers = [peer for peer in net.nodes if peer is not node and peer.is_running()]
+        cls.run_parallel(lambda peer: peer.add_peer(node.enode), peers, jobs=len(peers))
+
+    @classmethod
+    def make_proposal(cls, net, node):
+        """Proposes the node's main account as its node type to the Governing contract. The governors then have to vote on the proposal."""
+        governing = cls.governing_contract(net)
+        if governing.get_artifact() is None:
+            governing.compile()
+
+        governors = [g for g in (net.governors or []) if g.is_running() and g.acc_addrs is not None and g.acc_addrs.get("main") != node.acc_addrs["main"]]
+        if governors == []:
+            raise NodeNotReadyErr(f"No running governor found to propose node '{node.name}'.")
+
+        proposal_id = governors[0].make_proposal(governing, node.acc_addrs["main"], node.type)
+        print(f"{Deco.INFO}[INFO]{Deco.RESET}\tProposed {node.type} node '{node.name}' as proposal '{proposal_id}', it is accepted when the governors have voted for it.")
+
+class Snapshot(Command):
+    """Saves the network directory of the stopped network as a snapshot, which can be restored later on."""
+    HELP = "Saves the network directory as snapshot with given tag."
+
+    FLAGS = {
+        "help": False,
+        "force": False,
+        "tag": None
+    }
+
+    # characters allowed in snapshot tags
+    TAG_CHARS = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._-")
+
+    @classmethod
+    def helpstr(cls):
+        cmd = cls.__name__.lower()
+        usage = f"Usage like:\n\t{Command.NAME} {cmd} [FLAGS] [TAG]\n"
+        flgs = (
+            "Flags\n"
+            "\t-f, --force\tOverwrites an existing snapshot with the same tag.\n"
+            "\t-h, --help\tPrints help and exits.\n"
+        )
+        helpstr = usage + "\n" + cls.HELP + " Lists all snapshots if no tag is given." + "\n" + "\n" + flgs + "\n"
+
+        return helpstr
+
+    @classmethod
+    def parse_flags(cls, flgs):
+        for flg in flgs:
+            if flg in ["help", "--help", "-h"]:
+                cls.FLAGS["help"] = True
+            elif flg in ["--force", "-f"]:
+                cls.FLAGS["force"] = True
+            elif flg.startswith("-") or cls.FLAGS["tag"] is not None:
+                raise InvalidFlagErr(f"Invalid flag '{flg}' for subcommand '{cls.__name__.lower()}'")
+            else:
+                cls.FLAGS["tag"] = flg
+
+        return cls.FLAGS
+
+    @classmethod
+    def exec(cls, net, flags=[]):
+        try:
+            flgs = cls.parse_flags(flags)
+        except InvalidFlagErr as err:
+            return cls.handle_err(err)
+
+        # check flags
+        if flgs["help"]:
+            print(cls.helpstr())
+            return 0
+
+        try:
+            if flgs["tag"] is None:
+                cls.print_snapshots(net)
+            else:
+                cls.print_progress(f"Saving snapshot '{flgs['tag']}' of network '{net.name}'.", cls.save_snapshot, net, flgs["tag"], flgs["force"])
+        except Exception as err:
+            return cls.handle_err(err)
+
+        return 0
+
+    @classmethod
+    def snapshot_dir(cls, net, tag):
+        """Returns the directory of the network's snapshot with given tag."""
+        if tag == "" or not set(tag) <= cls.TAG_CHARS or tag.startswith("."):
+            raise InvalidSnapshotTagErr(f"Invalid snapshot tag '{tag}', only letters, digits, '.', '_' and '-' are allowed.")
+
+        return os.path.join(cls.SNAPSHOTDIR, net.name, tag)
+
+    @classmethod
+    def tags(cls, net):
+        """Returns the tags of all snapshots of the network."""
+        try:
+            return sorted(tag for tag in os.listdir(os.path.join(cls.SNAPSHOTDIR, net.name)) if not tag.startswith("."))
+        except FileNotFoundError:
+            return []
+
+    @classmethod
+    def print_snapshots(cls, net):
+        """Prints the tags of all snapshots of the network."""
+        str = f"{Deco.STATUS}[STAT]{Deco.RESET}\tSnapshots of network '{net.name}'"
+        for tag in cls.tags(net):
+            str += f"\n\t{tag}"
+        print(str)
+
+    @classmethod
+    def save_snapshot(cls, net, tag, force=False):
+        """Copies the network directory to the snapshot directory. Nodes have to be stopped, so that their chaindata is consistent."""
+        dir = cls.snapshot_dir(net, tag)
+        if os.path.exists(dir) and not force:
+            raise SnapshotExistsErr(f"Snapshot '{tag}' of network '{net.name}' already exists. Use 'snapshot --force {tag}' to overwrite it.")
+        if not os.path.isdir(net.dir):
+            raise NetworkDirDoesNotExistErr(f"No such network '{net.name}' with network directory '{net.dir}'.")
+
+        running = [node.name for node in net.nodes if node.is_running()]
+        if running != []:
+            raise NodeAlreadyRunningErr(f"Nodes {running} are running. Please shut all nodes down with 'down' before taking a snapshot.")
+
+        # the snapshot has to contain all changes of this command run
+        net.save()
+
+        # copying to a temporary directory first, so that a failed copy never leaves an incomplete snapshot
+        tmp_dir = os.path.join(os.path.dirname(dir), f".{tag}.tmp")
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        os.makedirs(os.path.dirname(dir), exist_ok=True)
+        Files.link_tree(net.dir, tmp_dir)
+
+        if os.path.exists(dir):
+            shutil.rmtree(dir)
+        os.rename(tmp_dir, dir)
+
+class Restore(Command):
+    """Restores the network directory from a snapshot."""
+    HELP = "Restores the network directory from the snapshot with given tag."
+
+    FLAGS = {
+        "help": False,
+        "tag": None
+    }
+
+    @classmethod
+    def helpstr(cls):
+        cmd = cls.__name__.lower()
+        usage = f"Usage like:\n\t{Command.NAME} {cmd} [FLAGS] TAG\n"
+        flgs = (
+            "Flags\n"
+            "\t-h, --help\tPrints help and exits.\n"
+        )
+        helpstr = usage + "\n" + cls.HELP + " Running nodes are shut down before." + "\n" + "\n" + flgs + "\n"
+
+        return helpstr
+
+    @classmethod
+    def parse_flags(cls, flgs):
+        for flg in flgs:
+            if flg in ["help", "--help", "-h"]:
+                cls.FLAGS["help"] = True
+            elif flg.startswith("-") or cls.FLAGS["tag"] is not None:
+                raise InvalidFlagErr(f"Invalid flag '{flg}' for subcommand '{cls.__name__.lower()}'")
+            else:
+                cls.FLAGS["tag"] = flg
+
+        if not cls.FLAGS["help"] and cls.FLAGS["tag"] is None:
+            raise InvalidFlagErr(f"Subcommand '{cls.__name__.lower()}' needs the tag of the snapshot to restore.")
 
-        return args
+        return cls.FLAGS
 
     @classmethod
-    def ccbdc_contract_args(cls, net):
-        """Arguments for the CBDC contract."""
-        # get governing contract address for CBDC contract since it is needed
-        addr = None
-        for c in net.contracts:
-            if c.name == "Governing":
-                addr = c.addr
-                break
+    def exec(cls, net, flags=[]):
+        try:
+            flgs = cls.parse_flags(flags)
+        except InvalidFlagErr as err:
+            return cls.handle_err(err)
 
-        return [addr]
+        # check flags
+        if flgs["help"]:
+            print(cls.helpstr())
+            return 0
 
-    @classmethod
-    def contract_setup(cls, net):
-        """Calls contract setup functions to fully set them up."""
-        if net.maintainers is not None and net.maintainers != []:
-            lead_maintainer = net.maintainers[0]
-            for contract in net.contracts:
-                # create args for constructor of special contracts that depend on each other such as Governing.sol
-                if contract.name == "CBDC":
-                    for c in net.contracts:
-                        if c.name == "CCBDC":
-                            addr = c.addr
-                            break
-                    cls.print_progress(f"Setting up contract '{contract.name}'.", lead_maintainer.setup_contract, contract, addr)
-                elif contract.name == "CCBDC":
-                    for c in net.contracts:
-                        if c.name == "CBDC":
-                            addr = c.addr
-                            break
-                    cls.print_progress(f"Setting up contract '{contract.name}'.", lead_maintainer.setup_contract, contract, addr)
-        else:
-            raise NoMaintainerPresentErr(f"There is no maintainer configured in the network's config file, ergo you cannot deploy smart contracts.")
+        try:
+            dir = Snapshot.snapshot_dir(net, flgs["tag"])
+            if not os.path.isdir(dir):
+                raise SnapshotNotFoundErr(f"No snapshot '{flgs['tag']}' of network '{net.name}' found. Available snapshots are {Snapshot.tags(net)}.")
+
+            # shutdown nodes before replacing their directories
+            Down.shut_down_nodes(net)
+            cls.print_progress(f"Restoring snapshot '{flgs['tag']}' of network '{net.name}'.", cls.restore_snapshot, net, dir)
+        except Exception as err:
+            return cls.handle_err(err)
+
+        return 0
 
     @classmethod
-    def copy_contract_info(cls, net):
-        """Copies contract interaction tools to nodes."""
-        for c in net.contracts:
-            for node in net.nodes:
-                c.copy_info_to(node.dir)
+    def restore_snapshot(cls, net, dir):
+        """Replaces the network directory with a copy of given snapshot directory."""
+        # uncommitted changes belong to the replaced network directory
+        net.state.reset()
+        if os.path.exists(net.dir):
+            shutil.rmtree(net.dir)
+        Files.link_tree(dir, net.dir)
 
-class Down(Command):
-    """Shuts down all docker containers created from config file."""
-    HELP = "Stops and shuts down every node's docker container."
+class ResetChain(Command):
+    """Resets the blockchain of all nodes to the genesis block, while keeping nodekeys, accounts and the genesis block."""
+    HELP = "Resets the chain to the genesis block, keeping keys and accounts."
+
+    CMD = "reset-chain"
 
     FLAGS = {
         "help": False,
+        "jobs": 8
     }
 
     @classmethod
     def helpstr(cls):
-        cmd = cls.__name__.lower()
+        cmd = cls.cmd_name()
         usage = f"Usage like:\n\t{Command.NAME} {cmd} [FLAGS]\n"
         flgs = (
             "Flags\n"
+            "\t-j, --jobs N\tInitializes up to N nodes concurrently (default: 8).\n"
             "\t-h, --help\tPrints help and exits.\n"
         )
-        helpstr = usage + "\n" + cls.HELP + "\n" + "\n" + flgs + "\n"
+        helpstr = usage + "\n" + cls.HELP + " Deployed contracts have to be set up again with 'setup'." + "\n" + "\n" + flgs + "\n"
 
         return helpstr
 
     @classmethod
     def parse_flags(cls, flgs):
+        flgs = iter(flgs)
         for flg in flgs:
             if flg in ["help", "--help", "-h"]:
                 cls.FLAGS["help"] = True
+            elif flg in ["--jobs", "-j"]:
+                cls.FLAGS["jobs"] = cls.parse_jobs(next(flgs, None))
             else:
-                raise InvalidFlagErr(f"Invalid flag '{flg}' for subcommand '{cls.__name__.lower()}'")
+                raise InvalidFlagErr(f"Invalid flag '{flg}' for subcommand '{cls.cmd_name()}'")
 
         return cls.FLAGS
 
@@ -868,27 +2390,40 @@ class Down(Command):
     def exec(cls, net, flags=[]):
         try:
             flgs = cls.parse_flags(flags)
-        except InvalidFlagErr as err:
+        except (InvalidFlagErr, InvalidJobCountErr) as err:
             return cls.handle_err(err)
 
         # check flags
         if flgs["help"]:
             print(cls.helpstr())
             return 0
-        
+
         try:
-            cls.shut_down_nodes(net)
+            if not os.path.isfile(net.genesis.path):
+                raise GenesisBlockNotFoundErr(f"No genesis block found at '{net.genesis.path}'. Is the network initialized?")
+
+            # shutdown nodes before deleting their chaindata
+            Down.shut_down_nodes(net)
+            cls.print_progress(f"Resetting chain of {len(net.nodes)} nodes.", cls.run_parallel, cls.reset_node, net.nodes, jobs=flgs["jobs"])
+            cls.print_progress("Forgetting deployed contracts.", cls.reset_contracts, net)
         except Exception as err:
-            cls.handle_err(err)
+            return cls.handle_err(err)
 
         return 0
 
     @classmethod
-    def shut_down_nodes(cls, net):
-        """Boots up all given nodes in docker containers with node.name as container name."""
-        for node in net.nodes:
-            if node.is_running():
-                cls.print_progress(f"Shutting down node '{node.name}'.", node.down)
+    def reset_node(cls, node):
+        """Removes a node's chaindata and calls 'geth init ...' with the network's genesis block again."""
+        node.reset_chain()
+        node.init()
+
+    @classmethod
+    def reset_contracts(cls, net):
+        """Forgets the addresses of all deployed contracts and removes their info from the nodes."""
+        for c in net.contracts:
+            c.reset()
+            for node in net.nodes:
+                c.remove_info_from(node.dir)
 
 # UTILITIES
 class Config(object):
@@ -931,9 +2466,9 @@ class Config(object):
         return string
 
     def save(self):
-        """Saves a config object by writing its important attributes to a 'info.json' in its working directory."""
+        """Saves a config object by staging its important attributes in the network's state store. They are written on the next commit of the store."""
         # checking if object can be saved
-        if hasattr(self, "SAVABLE_ATTRIBUTES") and hasattr(self, "dir"):
+        if hasattr(self, "SAVABLE_ATTRIBUTES") and hasattr(self, "dir") and getattr(self, "state", None) is not None:
             # deciding which keys to save
             dict = {}
             for attr in self.SAVABLE_ATTRIBUTES:
@@ -942,91 +2477,445 @@ class Config(object):
                 elif attr in dir(self.__class__):
                     dict[attr] = getattr(self.__class__, attr)(self)
 
-            # write keys to file
-            try:
-                with open(os.path.join(self.dir, "info.json"), "w") as f:
-                    json.dump(dict, f, indent=2)
-            except:
-                raise Exception(f"Could not write '{self.name}' dictionary to 'info.json'.")
+            self.state.set(self.STATE_SECTION, self.name, dict, export=os.path.join(self.dir, "info.json"))
         else:
             raise ObjNotSavableErr(f"Object '{self.name}' is not savable.")
 
     def info_file_attribs(self):
-        """Checks if 'info.json' exists and reads attributes from it."""
-        info_file = os.path.join(self.dir, "info.json")
-        if os.path.isfile(info_file):
+        """Reads attributes from the network's state store. Falls back to the object's 'info.json' for networks initialized before the store existed."""
+        attr_dict = self.state.get(self.STATE_SECTION, self.name)
+        if attr_dict is None:
+            info_file = os.path.join(self.dir, "info.json")
+            if not os.path.isfile(info_file):
+                return
             with open(info_file, "r") as f:
-                content = f.read()
+                attr_dict = json.load(f)
+
+        for attr in attr_dict:
+            if attr in self.__dict__.keys():
+                self.__dict__[attr] = attr_dict[attr]
 
-            attr_dict = json.loads(content)
+class State(object):
+    """Represents the network's state store, a single 'state.json' in the network directory holding the saved attributes of all nodes and contracts. Changed entries are tracked and written together in one atomic commit."""
 
-            for attr in attr_dict:
-                if attr in self.__dict__.keys():
-                    self.__dict__[attr] = attr_dict[attr]
+    SECTIONS = ["nodes", "contracts", "steps"]
+
+    def __init__(self, path):
+        self.path = path
+        self.data = None
+        self.dirty = {}
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Reads the whole store with a single read."""
+        data = {}
+        if os.path.isfile(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+            except:
+                raise ReadingInfoFileErr(f"Could not read network state at '{self.path}'.")
+
+        for section in self.SECTIONS:
+            data.setdefault(section, {})
+        self.data = data
+
+    def get(self, section, name):
+        """Returns the saved entry of an object or None if there is none."""
+        with self.lock:
+            if self.data is None:
+                self.load()
+
+            return self.data[section].get(name)
+
+    def set(self, section, name, entry, export=None):
+        """Stages an entry for the next commit. If 'export' is given, the entry is also written to that path on commit, e.g. as 'info.json' for the node's command line tools."""
+        with self.lock:
+            if self.data is None:
+                self.load()
+
+            self.data[section][name] = entry
+            self.dirty[(section, name)] = export
+
+    def remove(self, section, name, export=None):
+        """Removes the entry of an object with the next commit. If 'export' is given, that file is removed on commit as well."""
+        with self.lock:
+            if self.data is None:
+                self.load()
+
+            self.data[section].pop(name, None)
+            self.dirty[(section, name)] = export
+
+    def append(self, section, name, value):
+        """Appends a value to the list entry of an object, if it is not part of it yet, and stages the entry for the next commit."""
+        with self.lock:
+            if self.data is None:
+                self.load()
+
+            entry = list(self.data[section].get(name) or [])
+            if value not in entry:
+                entry.append(value)
+                self.data[section][name] = entry
+                self.dirty[(section, name)] = None
+
+    def reset(self):
+        """Forgets all entries, e.g. after the network directory was deleted."""
+        with self.lock:
+            self.data = None
+            self.dirty = {}
+
+    def commit(self):
+        """Atomically writes the store and exports of all changed entries, if there are any."""
+        with self.lock:
+            if self.dirty == {}:
+                return
+            # nothing to commit to, e.g. when the network has just been cleaned
+            if not os.path.isdir(os.path.dirname(self.path)):
+                self.dirty = {}
+                return
+
+            self.dump(self.path, self.data)
+            for (section, name), export in self.dirty.items():
+                if export is None:
+                    continue
+                # exports of removed entries are removed as well
+                if name not in self.data[section]:
+                    if os.path.isfile(export):
+                        os.remove(export)
+                elif os.path.isdir(os.path.dirname(export)):
+                    self.dump(export, self.data[section][name])
+            self.dirty = {}
+
+    @classmethod
+    def dump(cls, path, data):
+        """Writes given data as JSON to a temporary file and moves it into place, so that readers never see a truncated file."""
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except:
+            raise WritingInfoFileErr(f"Could not write '{path}'.")
+
+class Step(object):
+    """Represents a step of a pipeline, e.g. of the network initialization. A step either runs once for the whole network or once for each of its nodes. It is complete for an item if its completion check says so or, for steps without a check, if the step is recorded as completed in the network's state store."""
+
+    STATE_SECTION = "steps"
+
+    def __init__(self, name, string, function, deps=[], nodes=None, check=None):
+        self.name = name
+        self.string = string
+        self.function = function
+        self.deps = deps
+        self.nodes = nodes
+        self.check = check
+
+    def items(self, net):
+        """Returns the network itself for network-wide steps and the nodes of the step otherwise."""
+        if self.nodes is None:
+            return [net]
+
+        return self.nodes(net) or []
+
+    def is_done(self, net, item):
+        """Checks if the step has been completed for an item."""
+        if self.check is not None:
+            return self.check(item)
+
+        return self.name in (net.state.get(self.STATE_SECTION, item.name) or [])
+
+    def pending(self, net, redo=False):
+        """Returns all items the step still has to run for. Steps without completion check run for all items when redone."""
+        items = self.items(net)
+        if redo and self.check is None:
+            return items
+
+        return [item for item in items if not self.is_done(net, item)]
+
+    def is_async(self):
+        """Checks if the step's function is a coroutine function."""
+        return asyncio.iscoroutinefunction(self.function)
+
+    def run(self, net, item):
+        """Runs the step for an item and records it as completed."""
+        if self.nodes is None:
+            self.function(net)
+        else:
+            self.function(net, item)
+
+        net.state.append(self.STATE_SECTION, item.name, self.name)
+
+    async def run_async(self, net, item):
+        """Awaits the step's coroutine function for an item and records it as completed."""
+        if self.nodes is None:
+            await self.function(net)
+        else:
+            await self.function(net, item)
+
+        net.state.append(self.STATE_SECTION, item.name, self.name)
+
+class Solc():
+    """Represents a content-addressed cache of solc compilation artifacts. Artifacts are cached per source file, keyed by the contract sources, the solc version and the optimizer settings. All source files missing from the cache are compiled with one '--combined-json' invocation."""
+    BIN = "solc"
+    OPTIMIZE_RUNS = 1000
+    OUTPUTS = "abi,bin,bin-runtime"
+    CACHEDIR = os.path.join(Command.CACHEDIR, "solc")
+
+    VERSION = None
+
+    @classmethod
+    def version(cls):
+        """Returns the version string of the solc binary, it is only queried once."""
+        if cls.VERSION is None:
+            cls.VERSION = Shell.call(f"{cls.BIN} --version", check_ret=True).strip()
+
+        return cls.VERSION
+
+    @classmethod
+    def key(cls, paths):
+        """Hashes all sources next to the given contracts (to include their imports), the solc version and the compiler settings."""
+        sources = set()
+        for path in paths:
+            src_dir = os.path.dirname(os.path.abspath(path))
+            sources.update(os.path.join(src_dir, f) for f in os.listdir(src_dir) if f.endswith(".sol"))
+
+        sha = hashlib.sha256()
+        sha.update(cls.version().encode("utf-8"))
+        sha.update(f"--optimize --optimize-runs={cls.OPTIMIZE_RUNS} --combined-json {cls.OUTPUTS}".encode("utf-8"))
+        for path in sorted(paths):
+            sha.update(path.encode("utf-8"))
+        for src in sorted(sources):
+            sha.update(src.encode("utf-8"))
+            with open(src, "rb") as f:
+                sha.update(hashlib.sha256(f.read()).digest())
+
+        return sha.hexdigest()
+
+    @classmethod
+    def lookup(cls, path):
+        """Returns the cached artifacts of the contracts in a source file by contract name or None on a cache miss."""
+        cache_file = os.path.join(cls.CACHEDIR, f"{cls.key([path])}.json")
+        if not os.path.isfile(cache_file):
+            return None
+
+        with open(cache_file, "r") as f:
+            return json.load(f)
+
+    @classmethod
+    def compile(cls, paths):
+        """Returns artifacts by contract name, compiling all source files missing from the cache at once."""
+        artifacts = {}
+        missing = []
+        for path in paths:
+            cached = cls.lookup(path)
+            if cached is None:
+                missing.append(path)
+            else:
+                artifacts.update(cached)
+        if missing == []:
+            return artifacts
+
+        cmd = f"{cls.BIN} --optimize --optimize-runs={cls.OPTIMIZE_RUNS} --combined-json {cls.OUTPUTS} {' '.join(missing)}"
+        out = json.loads(Shell.call(cmd, check_ret=True))
+
+        by_path = {os.path.abspath(path): {} for path in missing}
+        for id, output in out["contracts"].items():
+            src, name = id.rsplit(":", 1)
+            abi = output["abi"]
+            # older solc versions return the ABI as JSON string
+            if isinstance(abi, str):
+                abi = json.loads(abi)
+            artifacts[name] = {"abi": abi, "bin": output["bin"], "bin-runtime": output["bin-runtime"]}
+            # contracts of imported sources are returned too, they are only cached with their own source file
+            if os.path.abspath(src) in by_path:
+                by_path[os.path.abspath(src)][name] = artifacts[name]
+
+        os.makedirs(cls.CACHEDIR, exist_ok=True)
+        for path in missing:
+            State.dump(os.path.join(cls.CACHEDIR, f"{cls.key([path])}.json"), by_path[os.path.abspath(path)])
+
+        return artifacts
+
+class Web3Session(object):
+    """Represents a web3 connection to a node that is kept alive for a whole command run. The node's main account is unlocked once for a bounded duration instead of once per operation."""
+
+    # seconds an account stays unlocked in geth
+    UNLOCK_DURATION = 300
+    # seconds before expiry at which an account is unlocked again
+    UNLOCK_MARGIN = 30
+
+    def __init__(self, url, addr, passphrase):
+        self.url = url
+        self.addr = addr
+        self.passphrase = passphrase
+        self.w3 = None
+        self.unlocked_until = 0
+        self.lock = threading.Lock()
+
+    def connect(self):
+        """Returns the session's web3 connection, creating it on first use."""
+        if self.w3 is None:
+            import web3
+            from web3 import Web3
+
+            # one provider keeps one pool of keep-alive HTTP connections
+            w3 = Web3(Web3.HTTPProvider(self.url))
+            w3.middleware_onion.inject(web3.middleware.geth_poa_middleware, layer=0)
+            w3.eth.defaultAccount = self.addr
+            self.w3 = w3
+
+        return self.w3
+
+    def unlocked(self):
+        """Returns the session's web3 connection and unlocks the account if it is not unlocked (long enough) already."""
+        with self.lock:
+            w3 = self.connect()
+            if time.monotonic() > self.unlocked_until - self.UNLOCK_MARGIN:
+                w3.geth.personal.unlockAccount(self.addr, self.passphrase, self.UNLOCK_DURATION)
+                self.unlocked_until = time.monotonic() + self.UNLOCK_DURATION
+
+        return w3
+
+class Genesis(object):
+    """Represents the network's genesis block. Alloc entries, extraData and predeployed code are collected in memory and written once to the network directory, from where all nodes link it."""
+
+    def __init__(self, path):
+        self.path = path
+        self.dict = None
+
+    def load(self, template):
+        """Reads a genesis template, e.g. created by 'istanbul setup ...', with an empty alloc field."""
+        try:
+            with open(template, "r") as f:
+                self.dict = json.load(f)
+        except:
+            raise GenesisBlockErr(f"Could not read genesis template at '{template}'.")
+
+        self.dict["alloc"] = {}
+
+    @property
+    def extra_data(self):
+        return self.dict["extraData"]
+
+    @extra_data.setter
+    def extra_data(self, extra_data):
+        self.dict["extraData"] = extra_data
+
+    def alloc(self, addr, balance):
+        """Pre-allocates funds for a given address."""
+        entry = self.dict["alloc"].setdefault(addr, {})
+        entry["balance"] = str(balance)
+
+    def predeploy(self, addr, code, balance=0):
+        """Places given bytecode at a given address."""
+        entry = self.dict["alloc"].setdefault(addr, {})
+        entry["code"] = code
+        entry.setdefault("balance", str(balance))
+
+    def write(self):
+        """Writes the genesis block to the network directory."""
+        if self.dict is None:
+            raise GenesisBlockErr("Genesis block has not been composed yet. Are the validators setup already?")
+
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.dict, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except:
+            raise GenesisBlockErr(f"Could not write 'genesis.json' at '{self.path}'.")
+
+    def link_to(self, dir):
+        """Hardlinks the written genesis block into the given directory, falls back to copying it if linking is not possible."""
+        dst = os.path.join(dir, "genesis.json")
+        try:
+            if os.path.lexists(dst):
+                os.remove(dst)
+            try:
+                os.link(self.path, dst)
+            except OSError:
+                shutil.copy(self.path, dst)
+        except:
+            raise GenesisBlockErr(f"Could not place 'genesis.json' at '{dst}'.")
 
 class Network(Config):
     """Represents a network config .yaml file as an object and builds functionality and class definitions on top of it."""
 
     MANDATORY_KEYS = ["id", "name", "orgs", "validators", "docker-settings"]
-    OPTIONAL_KEYS = ["contracts", "governors", "bankers", "maintainers", "observers"]
+    OPTIONAL_KEYS = ["contracts", "governors", "bankers", "maintainers", "observers", "keystore", "account-pools"]
 
     def __init__(self, name, config_dict, work_dir):
         super().__init__(name, config_dict)
 
         # setting utility properties which are independent from the config-file
         self.dir = os.path.join(work_dir, self.name)
+        self.genesis = Genesis(os.path.join(self.dir, "genesis.json"))
+        self.state = State(os.path.join(self.dir, "state.json"))
 
         # defining docker-settings
         self.docker_settings = DockerSettings(None, config_dict["docker-settings"])
 
-        # defining nodes from input dictionaries
+        # nodes, contracts and account pools are only built on first access, so that commands which do not need them skip the work
+        self.configs = {}
+        for attr in [node_type + "s" for node_type in Node.TYPES] + ["contracts", "account_pools"]:
+            self.configs[attr] = self.__dict__.pop(attr, None)
+
+    def __getattr__(self, attr):
+        """Materializes the lazily built attributes 'nodes', the node lists of every node type, 'contracts' and 'account_pools' on their first access."""
+        # guarding against lookups before __init__ has set the configs
+        configs = self.__dict__.get("configs")
+        if configs is None or (attr != "nodes" and attr not in configs):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{attr}'")
+
+        if attr == "contracts":
+            self.contracts = [self.create_contract(contract_dict) for contract_dict in configs["contracts"] or []]
+        elif attr == "account_pools":
+            self.account_pools = []
+            for pool_dict in configs["account_pools"] or []:
+                name = list(pool_dict.keys())[0]
+                self.account_pools.append(AccountPool(name, pool_dict[name], self.dir))
+        else:
+            self.create_nodes()
+
+        return self.__dict__[attr]
+
+    def create_nodes(self):
+        """Creates the node objects of every node type from the config file. Node types missing from the config file are set to None."""
         self.nodes = []
         for node_type in Node.TYPES:
-            # trying if node of current type is in config file
             attr = node_type + "s"
-            try:
-                if attr in self.__dict__.keys() and self.__dict__[attr] is not None:
-                    node_dicts = self.__dict__[attr]
-                    nodes = []
-                    for node_dict in node_dicts:
-                        node_name = list(node_dict.keys())[0]
-                        node = self.create_node(node_dict, node_type)
-                        nodes.append(node)
-
-                    # adding the nodes to self.nodes and to self."node-type" as an attribute
-                    self.nodes.extend(nodes)
-                    self.__dict__[attr] = nodes
-            except:
-                traceback.print_exc()
-                print()
+            node_dicts = self.configs.get(attr)
+            if node_dicts is None:
+                self.__dict__[attr] = None
+                continue
 
-        # defining contracts
-        contracts = []
-        for contract_dict in self.contracts:
-            contract = self.create_contract(contract_dict)
-            contracts.append(contract)
+            nodes = [self.create_node(node_dict, node_type) for node_dict in node_dicts]
 
-        self.contracts = contracts
+            # adding the nodes to self.nodes and to self."node-type" as an attribute
+            self.nodes.extend(nodes)
+            self.__dict__[attr] = nodes
 
     def create_node(self, node_dict, type):
         """Creates a node object of specific type."""
         name = list(node_dict.keys())[0]
         # TODO: Add other node types
         if type == "validator":
-            return Validator(name, type, node_dict[name], self.dir, self.docker_settings.geth_port, self.docker_settings.rpc_port, self.docker_settings.workdir)
+            return Validator(name, type, node_dict[name], self.dir, self.docker_settings.geth_port, self.docker_settings.rpc_port, self.docker_settings.workdir, self.state)
         elif type == "maintainer":
-            return Maintainer(name, type, node_dict[name], self.dir, self.docker_settings.geth_port, self.docker_settings.rpc_port, self.docker_settings.workdir)
+            return Maintainer(name, type, node_dict[name], self.dir, self.docker_settings.geth_port, self.docker_settings.rpc_port, self.docker_settings.workdir, self.state)
         elif type == "governor":
-            return Governor(name, type, node_dict[name], self.dir, self.docker_settings.geth_port, self.docker_settings.rpc_port, self.docker_settings.workdir)
+            return Governor(name, type, node_dict[name], self.dir, self.docker_settings.geth_port, self.docker_settings.rpc_port, self.docker_settings.workdir, self.state)
         elif type == "banker":
-            return Banker(name, type, node_dict[name], self.dir, self.docker_settings.geth_port, self.docker_settings.rpc_port, self.docker_settings.workdir)
+            return Banker(name, type, node_dict[name], self.dir, self.docker_settings.geth_port, self.docker_settings.rpc_port, self.docker_settings.workdir, self.state)
         elif type == "observer":
-            return Observer(name, type, node_dict[name], self.dir, self.docker_settings.geth_port, self.docker_settings.rpc_port, self.docker_settings.workdir)
+            return Observer(name, type, node_dict[name], self.dir, self.docker_settings.geth_port, self.docker_settings.rpc_port, self.docker_settings.workdir, self.state)
     
     def create_contract(self, contract_dict):
         """Creates a contract object."""
         name = list(contract_dict.keys())[0]
-        return Contract(name, contract_dict[name], self.dir)
+        return Contract(name, contract_dict[name], self.dir, self.state)
 
     def create_dir(self):
         try:
@@ -1034,11 +2923,15 @@ class Network(Config):
         except FileExistsError as err:
             raise NetworkDirExistsErr(f"Network directory already exists at '{self.dir}'. Please use the 'init --reset' if you want to reset the network.")
 
+    def save(self):
+        """Commits all changes of nodes and contracts to the network's state store."""
+        self.state.commit()
+
 class DockerSettings(Config):
     """Represents docker-settings from network config file."""
 
     MANDATORY_KEYS = ["network-driver", "subnet", "geth-port", "rpc-port", "workdir"]
-    OPTIONAL_KEYS = ["contracts", "governors", "bankers", "maintainers", "observers"]
+    OPTIONAL_KEYS = ["contracts", "governors", "bankers", "maintainers", "observers", "quorum-revision"]
 
 class Contract(Config):
     """Represents a solidity smart contract from the config file as an object."""
@@ -1047,14 +2940,18 @@ class Contract(Config):
     OPTIONAL_KEYS = []
 
     SAVABLE_ATTRIBUTES = ["addr", "get_abi"]
+    STATE_SECTION = "contracts"
 
-    def __init__(self, name, config_dict, net_dir):
+    def __init__(self, name, config_dict, net_dir, state):
         super().__init__(name, config_dict)
 
         self.dir = os.path.join(net_dir, "contracts", self.name)
         self.info_file = os.path.join(self.dir, "info.json")
-        self.bin = os.path.join(self.dir, "bin")
         self.addr = None
+        self.state = state
+
+        # compilation artifacts (abi, bin, bin-runtime) from the solc cache
+        self.artifact = None
 
         try:
             self.info_file_attribs()
@@ -1063,69 +2960,54 @@ class Contract(Config):
 
     def create_dir(self):
         try:
-            os.makedirs(self.bin, exist_ok=True)
+            os.makedirs(self.dir, exist_ok=True)
         except Exception as err:
             raise ContractDirCreationErr(f"Could not create directory for contract '{self.name}'.")
 
-    def get_bytecode(self):
+    def get_artifact(self):
+        """Gets this contract's compilation artifacts from the solc cache, without compiling on a cache miss."""
+        if self.artifact is None:
+            artifacts = Solc.lookup(self.path)
+            if artifacts is not None:
+                self.artifact = artifacts.get(self.name)
+
+        return self.artifact
+
+    def get_bytecode(self, runtime=False):
         """Gets bytecode of this contract as 0x-prefixed hex string."""
-        bins = os.listdir(self.bin)
-        contract_bin = None
-        for cbin in bins:
-            if cbin == f"{self.name}.bin":
-                contract_bin = os.path.join(self.bin, cbin)
-                break
-        if cbin is None:
+        artifact = self.get_artifact()
+        if artifact is None:
             raise ByteCodeNotFoundErr(f"Bytecode for contract '{self.name}' was not found. Is it already compiled?")
 
-        try:
-            bytecode = "0x"
-            with open(contract_bin, "r") as f:
-                bytecode += f.read()
-        
-            return bytecode
-        except:
-            raise ByteCodeNotFoundErr(f"Bytecode for contract '{self.name}' was not found. Is it already compiled?")
+        return "0x" + artifact["bin-runtime" if runtime else "bin"]
 
     def get_abi(self, load_json=False):
         """Gets ABI of this contract as python dictionary."""
-        abis = os.listdir(self.dir)
-        abi = os.path.join(self.dir, abis[0])
-        for a in abis:
-            if a == f"{self.name}.abi":
-                abi = os.path.join(self.dir, a)
-                break
-        if abi is None:
+        artifact = self.get_artifact()
+        if artifact is None:
             raise AbiNotFoundErr(f"ABI for contract '{self.name}' was not found. Is it already compiled?")
 
-        try:
-            with open(abi, "r") as f:
-                abi = f.read()
-
-            if load_json:
-                return abi
-            else:
-                abi = json.loads(abi)
-                return abi
-        except:
-            raise AbiNotFoundErr(f"ABI for contract '{self.name}' was not found. Is it already compiled?")
+        if load_json:
+            return json.dumps(artifact["abi"])
+        else:
+            return artifact["abi"]
 
-    def compile(self, runtime=False):
-        """Compiles contract to bytecode and ABI."""
+    @classmethod
+    def compile_all(cls, contracts):
+        """Compiles given contracts to bytecode and ABI with a single solc invocation, or takes them from the solc cache."""
         try:
-            # compile
-            if runtime:
-                cmd = f"solc --overwrite --optimize --optimize-runs=1000 --bin-runtime -o {self.bin} {self.path}"
-            else:
-                cmd = f"solc --overwrite --optimize --optimize-runs=1000 --bin -o {self.bin} {self.path}"
+            artifacts = Solc.compile([c.path for c in contracts])
+        except Exception as err:
+            raise ContractCompilationErr(f"Could not compile contracts: {err}")
 
-            Shell.call(cmd, check_ret=True)
+        for c in contracts:
+            if c.name not in artifacts:
+                raise ContractCompilationErr(f"Could not compile contract '{c.name}', no such contract in '{c.path}'.")
+            c.artifact = artifacts[c.name]
 
-            # create ABI
-            cmd = f"solc --abi --overwrite -o {self.dir} {self.path}"
-            Shell.call(cmd, check_ret=True)
-        except:
-            raise ContractCompilationErr(f"Could not compile contract '{self.name}'.")
+    def compile(self):
+        """Compiles contract to bytecode and ABI."""
+        self.compile_all([self])
 
     def deploy(self, w3):
         """Deploys a contract on the blockchain."""
@@ -1137,55 +3019,47 @@ class Contract(Config):
 
         return tx_hash
 
-    def write_to_genesis(self, validators):
-        """Writes compiled bytecode into genesis block."""
-        contract = os.listdir(self.bin)[0]
-        
+    def write_to_genesis(self, genesis):
+        """Writes compiled runtime bytecode into genesis block."""
         try:
-            bytecode = "0x"
-            with open(os.path.join(self.bin, contract), "r") as f:
-                bytecode += f.read() 
-
-            for val in validators:
-                genesis = val.get_genesis()
-                addr_dict = {
-                    "code": bytecode,
-                    "balance": "0"
-                }
-                genesis["alloc"][self.node_addr] = addr_dict
-                val.set_genesis(genesis)
-        except:
-            raise BytecodeNotReadableErr(f"Could not read contract '{self.name}' bytecode file '{contract}'.")
+            bytecode = self.get_bytecode(runtime=True)
+        except ByteCodeNotFoundErr:
+            raise BytecodeNotReadableErr(f"Could not read contract '{self.name}' runtime bytecode. Is it already compiled?")
 
-    def get_info_dict(self):
-        """Gets content saved to contract's 'info.json'."""
-        try:
-            with open(self.info_file, "r") as f:
-                data = f.read()
+        genesis.predeploy(self.addr, bytecode)
 
-            info_dict = json.loads(data)
+    def get_info_dict(self):
+        """Gets content saved for the contract in the network's state store."""
+        info_dict = self.state.get(self.STATE_SECTION, self.name)
+        if info_dict is None:
+            raise ReadingInfoFileErr(f"No saved info for contract '{self.name}' found. Is it already deployed?")
 
-            return info_dict
-        except:
-            raise ReadingInfoFileErr(f"'info.json' for contract '{self.name}' was not found at '{self.info_file}'.")
+        return info_dict
 
     def write_info_dict(self, info_dict):
-        """Writes a dictionary to contract's 'info.json'."""
-        try:
-            with open(self.info_file, "w") as f:
-                json.dump(info_dict, f)
-        except:
-            raise WritingInfoFileErr(f"Could not write to contract '{self.name}'s 'info.json' at '{self.info_file}'. Does it exist?")
+        """Stages a dictionary as the contract's info in the network's state store."""
+        self.state.set(self.STATE_SECTION, self.name, info_dict, export=self.info_file)
 
     def write_contract_addr(self, addr):
         """Writes the contracts address to its directory."""
         info_dict = self.get_info_dict()
         info_dict["addr"] = addr
-        self.write_info_file(info_dict)
+        self.write_info_dict(info_dict)
 
     def copy_info_to(self, dir):
-        """Copies 'info.json' to given directory."""
-        shutil.copy(self.info_file, os.path.join(dir, f"{self.name}-contract.info"))
+        """Writes the contract's info to given directory, as read by the node's command line tools."""
+        State.dump(os.path.join(dir, f"{self.name}-contract.info"), self.get_info_dict())
+
+    def remove_info_from(self, dir):
+        """Removes the contract's info from given directory."""
+        info_file = os.path.join(dir, f"{self.name}-contract.info")
+        if os.path.isfile(info_file):
+            os.remove(info_file)
+
+    def reset(self):
+        """Forgets the deployment of the contract, e.g. after the chain has been reset."""
+        self.addr = None
+        self.state.remove(self.STATE_SECTION, self.name, export=self.info_file)
 
     def print_status(self):
         """Prints node's status to stdoud."""
@@ -1205,29 +3079,89 @@ class Account(Config):
     MANDATORY_KEYS = ["passphrase"]
     OPTIONAL_KEYS = ["balance"]
 
-    GETH_BIN = os.path.join(Command.WORKDIR, "quorum", "build", "bin", "geth")
-
     def __init__(self, name, acc_dict):
         super().__init__(name, acc_dict)
 
         self.addr = None
 
-    def create(self, dir):
-        """Creates geth account."""
-        # call 'geth account new'
-        os.chdir(dir)
-        cmd = f"{self.GETH_BIN} --datadir {os.path.join(dir, 'data')} account new"
-        out = Shell.call(cmd, stdin=f"{self.passphrase}\n{self.passphrase}\n", check_ret=True)
-        os.chdir(Command.WORKDIR)
+    @classmethod
+    def keystore_dir(cls, dir):
+        """Returns the keystore directory of a node's working directory."""
+        return os.path.join(dir, "data", "keystore")
+
+    def create(self, dir, params=Keystore.DEFAULT_PARAMS):
+        """Creates geth account by writing a keystore file to the node's keystore directory."""
+        self.addr = Keystore.create(self.keystore_dir(dir), self.passphrase, params)
+
+class AccountPool(Config):
+    """Represents a pool of many funded accounts, e.g. senders for load tests. Keys are derived deterministically from a seed and written to a compact keys file instead of keystores."""
 
-        self.addr = self.get_addr(out)
+    MANDATORY_KEYS = ["count", "balance", "seed"]
+    OPTIONAL_KEYS = []
+
+    # every record of a keys file is a 32 byte private key followed by the 20 byte address
+    RECORD_SIZE = 52
+    # accounts derived per task of the process pool
+    CHUNK_SIZE = 1000
+
+    def __init__(self, name, pool_dict, net_dir):
+        super().__init__(name, pool_dict)
+
+        self.dir = os.path.join(net_dir, "account-pools")
+        self.keys_file = os.path.join(self.dir, f"{self.name}.keys")
 
-    def get_addr(self, out):
-        """Gets address from 'geth account new' output."""
-        out = out.replace("\n", " ")
-        for str in out.split(" "):
-            if str.startswith("0x"):
-                return str
+    @classmethod
+    def private_key(cls, seed, index):
+        """Derives the private key of the account at given index as keccak256(seed || index)."""
+        from eth_utils import keccak
+        private_key = keccak(seed.encode("utf-8") + index.to_bytes(8, "big"))
+        # hashing again keeps the derivation deterministic in the (unlikely) case of an invalid key
+        while not 0 < int.from_bytes(private_key, "big") < Keys.SECP256K1_N:
+            private_key = keccak(private_key)
+
+        return private_key
+
+    @classmethod
+    def derive(cls, seed, start, stop):
+        """Derives the records of the accounts in [start, stop) as bytes."""
+        from eth_keys import keys
+        records = bytearray()
+        for index in range(start, stop):
+            private_key = cls.private_key(seed, index)
+            records += private_key
+            records += keys.PrivateKey(private_key).public_key.to_canonical_address()
+
+        return bytes(records)
+
+    def create(self, executor=None):
+        """Derives all accounts of the pool, writes them to the pool's keys file and returns their addresses. Keys are derived by the given process pool, if there is one."""
+        count = int(self.count)
+        seed = str(self.seed)
+        chunks = [(start, min(start + self.CHUNK_SIZE, count)) for start in range(0, count, self.CHUNK_SIZE)]
+
+        if executor is None:
+            records = [self.derive(seed, start, stop) for start, stop in chunks]
+        else:
+            futures = [executor.submit(AccountPool.derive, seed, start, stop) for start, stop in chunks]
+            records = [future.result() for future in futures]
+
+        os.makedirs(self.dir, exist_ok=True)
+        tmp_file = f"{self.keys_file}.tmp"
+        # the keys file holds raw private keys, so it is only readable by its owner like keystores and nodekeys
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            for chunk in records:
+                f.write(chunk)
+        os.replace(tmp_file, self.keys_file)
+
+        addrs = []
+        for chunk in records:
+            for offset in range(0, len(chunk), self.RECORD_SIZE):
+                addrs.append("0x" + chunk[offset + 32:offset + self.RECORD_SIZE].hex())
+
+        return addrs
 
 class Node(Config):
     """Represents a basic quorum node as an object and builds functionality on top of its node directory."""
@@ -1239,16 +3173,20 @@ class Node(Config):
     # binary directories
     ISTANBUL_BIN = os.path.join(Command.WORKDIR, "istanbul-tools", "build", "bin", "istanbul")
     GETH_BIN = os.path.join(Command.WORKDIR, "quorum", "build", "bin", "geth")
-    BOOTNODE_BIN = os.path.join(Command.WORKDIR, "quorum", "build", "bin", "bootnode")
+
+    # seconds between two readiness probes
+    PROBE_INTERVAL = 0.5
 
     INIT_FILES = [os.path.join("data", "geth", "chaindata", "CURRENT"), os.path.join("data", "geth", "chaindata", "LOCK"), os.path.join("data", "geth", "chaindata", "LOG")]
     SAVABLE_ATTRIBUTES = ["node_addr", "enode", "acc_addrs", "container_id", "ip", "rpc_port", "is_init", "is_setup", "is_running"]
+    STATE_SECTION = "nodes"
 
-    def __init__(self, name, type, node_dict, net_dir, docker_geth_port, docker_rpc_port, docker_dir):
+    def __init__(self, name, type, node_dict, net_dir, docker_geth_port, docker_rpc_port, docker_dir, state):
         assert type in self.TYPES
         super().__init__(name, node_dict)
 
         self.type = type
+        self.state = state
 
         # functional attributes independent of config file
         self.dir = os.path.join(net_dir, self.org, self.type + "s", self.name)
@@ -1266,8 +3204,9 @@ class Node(Config):
         self.container_id = None
         self.node_addr = None
         self.enode = None
+        self.web3_session = None
 
-        # read attributes from info.json file if it exists
+        # read saved attributes from the network's state store
         try:
             self.info_file_attribs()
         except:
@@ -1299,15 +3238,59 @@ class Node(Config):
 
                 self.accs[acc_name] = acc_obj
 
-    def create_accs(self):
+    def create_accs(self, params=Keystore.DEFAULT_PARAMS):
         """Creates a geth accounts for this node."""
         if self.accs is not None:
             self.acc_addrs = {}
             for name, acc in self.accs.items():
-                acc.create(self.dir)
+                acc.create(self.dir, params)
                 self.acc_addrs[name] = acc.addr
         self.save()
 
+    def has_accs(self):
+        """Checks if all accounts of this node have been created and their keystore files exist."""
+        if self.accs is None:
+            return True
+        if self.acc_addrs is None or set(self.acc_addrs.keys()) != set(self.accs.keys()):
+            return False
+
+        try:
+            keystores = os.listdir(Account.keystore_dir(self.dir))
+        except FileNotFoundError:
+            return False
+
+        return all(any(f.endswith(addr[2:].lower()) for f in keystores) for addr in self.acc_addrs.values())
+
+    def add_peer(self, enode):
+        """Adds a peer to the running node, it is dialed and kept connected like a static node."""
+        return Rpc.call(self.rpc_url, "admin_addPeer", [enode])
+
+    @property
+    def chaindata_dir(self):
+        return os.path.join(self.geth_dir, "chaindata")
+
+    def seed(self, peer):
+        """Seeds the node's chaindata with a copy of a stopped peer's chaindata, which replaces 'geth init' and syncing the chain from genesis."""
+        if not peer.is_init():
+            raise NodeNotInitErr(f"Node '{peer.name}' has no chaindata to seed node '{self.name}' from. Is it initialized?")
+        if peer.is_running():
+            raise NodeAlreadyRunningErr(f"Node '{peer.name}' has to be stopped to seed node '{self.name}' from its chaindata.")
+
+        if os.path.exists(self.chaindata_dir):
+            shutil.rmtree(self.chaindata_dir)
+        Files.copy_tree(peer.chaindata_dir, self.chaindata_dir)
+        self.save()
+
+    def reset_chain(self):
+        """Removes the node's chaindata, while keeping its nodekey and keystores."""
+        for dir in [self.chaindata_dir, os.path.join(self.geth_dir, "lightchaindata")]:
+            if os.path.exists(dir):
+                shutil.rmtree(dir)
+
+    def has_nodekey(self):
+        """Checks if the node's nodekey has been created."""
+        return os.path.isfile(os.path.join(self.geth_dir, "nodekey"))
+
     def get_static_nodes(self):
         """Returns the nodes's local 'static-nodes.json' as a list."""
         try:
@@ -1331,11 +3314,12 @@ class Node(Config):
 
     def init(self):
         """Calls 'geth init ...' on node's working directory."""
-        os.chdir(self.dir)
-        uid = os.getuid()
+        Shell.sync(self.init_async())
+
+    async def init_async(self):
+        """Awaits 'geth init ...' on node's working directory."""
         cmd = f"{self.GETH_BIN} --datadir data init genesis.json"
-        ret = Shell.call(cmd, check_ret=True)
-        os.chdir(Command.WORKDIR)
+        await Shell.run(cmd, cwd=self.dir, check_ret=True)
         self.save()
 
     def is_init(self):
@@ -1361,16 +3345,9 @@ class Node(Config):
     def is_running(self):
         """Checks if docker container with node.name exists."""
         if self.is_init():
-            cmd = f"docker ps -aq --filter name={self.name}"
-            ret = Shell.call(cmd, check_ret=True)
-            if ret == "":
-                return False
-            else:
-                return True
+            return Docker.exists(self.name)
         else:
             return False
-        
-        return True
 
     def print_status(self):
         """Prints node's status to stdoud."""
@@ -1382,23 +3359,86 @@ class Node(Config):
                 str += f"\n\t{attr}: {getattr(self.__class__, attr)(self)}"
         print(str)
 
+    @property
+    def rpc_url(self):
+        return f"http://{self.ip}:{self.rpc_port}"
+
+    def session(self):
+        """Returns the node's web3 session, which is shared by every operation of a command run."""
+        if self.accs is None or "main" not in self.accs.keys():
+            raise MainAccountErr(f"No geth main account found for {self.type} node '{self.name}'.")
+
+        if self.web3_session is None:
+            main = self.accs["main"]
+            self.web3_session = Web3Session(self.rpc_url, main.addr, main.passphrase)
+
+        return self.web3_session
+
+    def block_number(self):
+        """Returns the node's current block number via RPC or None if the node does not answer."""
+        try:
+            return int(Rpc.call(self.rpc_url, "eth_blockNumber"), 16)
+        except Exception:
+            return None
+
+    def head_block(self):
+        """Returns number and hash of the node's latest block via RPC."""
+        block = Rpc.call(self.rpc_url, "eth_getBlockByNumber", ["latest", False])
+
+        return int(block["number"], 16), block["hash"]
+
+    def block_hash(self, number):
+        """Returns the hash of the node's block with given number via RPC or None if the node does not have it."""
+        block = Rpc.call(self.rpc_url, "eth_getBlockByNumber", [hex(number), False])
+        if block is None:
+            return None
+
+        return block["hash"]
+
+    def wait_until_ready(self, deadline, start):
+        """Polls the node's RPC until it answers and returns the seconds it took since 'start'."""
+        while self.block_number() is None:
+            if time.monotonic() > deadline:
+                raise NodeNotReadyErr(f"Node '{self.name}' did not answer RPC requests at '{self.rpc_url}' in time.")
+            time.sleep(self.PROBE_INTERVAL)
+
+        return {"rpc": time.monotonic() - start}
+
     def down(self):
         """Stops node's docker container."""
         if self.is_running():
-            cmd = f"docker stop {self.name}"
-            Shell.call(cmd, check_ret=False)
+            Docker.stop(self.name)
+            Docker.remove(self.name)
             self.save()
 
     def up(self, net):
-        """Boots up validator node in a docker container with name 'self.name'."""
+        """Boots up node in a docker container with name 'self.name'."""
+        Shell.sync(self.up_async(net))
+
+    async def up_async(self, net):
+        """Awaits booting up node in a docker container with name 'self.name'."""
         if not self.is_running():
-            uid = os.getuid()
-            cmd = f"docker run -d --rm --user {uid} -w {self.docker_dir} -v {self.dir}:{self.docker_dir} --name {self.name} --ip {self.docker_ip} -p {self.rpc_port}:{self.docker_rpc_port} -p {self.port}:{self.docker_geth_port} --network {net.name} -e ISTANBUL_BLOCK_PERIOD={self.ISTANBUL_BLOCK_PERIOD} -e NETWORK_ID={net.id} {self.type}"
-            self.container_id = Shell.call(cmd, check_ret=True).replace("\n", "")[:12]
+            self.container_id = await Docker.run_async(self.container_spec(net))
+            Docker.add(self.name, self.container_id)
             self.save()
         else:
             raise NodeAlreadyRunningErr(f"Node '{self.name}' is already running. Please shut all nodes down, before trying to boot up.")
 
+    def container_spec(self, net):
+        """Returns the spec of the docker container a validator node runs in. The validator image's default command starts geth."""
+        return {
+            "name": self.name,
+            "image": self.type,
+            "cmd": [],
+            "env": {"ISTANBUL_BLOCK_PERIOD": self.ISTANBUL_BLOCK_PERIOD, "NETWORK_ID": net.id},
+            "user": os.getuid(),
+            "workdir": self.docker_dir,
+            "binds": {self.dir: self.docker_dir},
+            "ports": {self.docker_rpc_port: self.rpc_port, self.docker_geth_port: self.port},
+            "network": net.name,
+            "ip": self.docker_ip
+        }
+
 class Validator(Node):
     """Represents a validor node as an object."""
 
@@ -1407,22 +3447,19 @@ class Validator(Node):
     # istanbul config
     ISTANBUL_BLOCK_PERIOD = 5
 
-    def __init__(self, name, type, node_dict, net_dir, docker_geth_port, docker_rpc_port, docker_dir):
+    def __init__(self, name, type, node_dict, net_dir, docker_geth_port, docker_rpc_port, docker_dir, state):
         assert type in self.TYPES
-        super().__init__(name, type, node_dict, net_dir, docker_geth_port, docker_rpc_port, docker_dir)
+        super().__init__(name, type, node_dict, net_dir, docker_geth_port, docker_rpc_port, docker_dir, state)
 
     def setup(self):
         """Calls 'istanbul setup ...' on validator's working directory."""
+        Shell.sync(self.setup_async())
+
+    async def setup_async(self):
+        """Awaits 'istanbul setup ...' on validator's working directory."""
         # call 'istanbul setup'
-        os.chdir(self.dir)
         cmd = f"{self.ISTANBUL_BIN} setup --num 1 --quorum --save --verbose"
-        out = Shell.call(cmd, check_ret=True)
-        os.chdir(Command.WORKDIR)
-
-        # empty the alloc field from created genesis block
-        genesis = self.get_genesis()
-        genesis["alloc"] = {}
-        self.set_genesis(genesis)
+        out = await Shell.run(cmd, cwd=self.dir, check_ret=True)
 
         # write utility attributes for later refrences
         self.node_addr, pubkey = self.extract_info_from_istanbul_output(out)
@@ -1439,6 +3476,25 @@ class Validator(Node):
         # finally: save node
         self.save()
 
+    def wait_until_ready(self, deadline, start):
+        """Waits until the validator answers RPC requests and its chain head advances, i.e. the consortium produces blocks."""
+        timings = super().wait_until_ready(deadline, start)
+
+        head = self.block_number()
+        while True:
+            number = self.block_number()
+            if number is not None and head is not None and number > head:
+                break
+            if head is None:
+                head = number
+            if time.monotonic() > deadline:
+                raise NodeNotReadyErr(f"Validator '{self.name}' did not produce a block in time.")
+            time.sleep(self.PROBE_INTERVAL)
+
+        timings["block"] = time.monotonic() - start
+
+        return timings
+
     def extract_info_from_istanbul_output(self, out):
         """Extracts validator address, enode info from 'istanbul setup ...' output."""
         val_info, _ = out.split("\n\n\n\n")
@@ -1494,30 +3550,12 @@ class Validator(Node):
         except:
             raise StaticNodesErr(f"Could not write static-nodes.json at '{self.dir}/data/data/static-nodes.json'.")
 
-    def form_consortium(self, vals):
-        """Edits genesis block of this validator to include given validators so that there is a consortium from the beginning."""
+    @classmethod
+    def form_consortium(cls, vals):
+        """Encodes the given validators into istanbul extraData, so that there is a consortium from the beginning."""
         val_addrs = [val.node_addr for val in vals]
-        
-        # creating a string to pass as an argument to 'istanbul extra encode ...'
-        addr_str = ""
-        for addr in val_addrs:
-            addr_str += f"{addr},"
-        addr_str = addr_str[:-1]
-
-        # calling 'istanbul extra encode ...' and write extra data to genesis file
-        cmd = f"{self.ISTANBUL_BIN} extra encode --validators={addr_str}"
-        extra_data = Shell.call(cmd, check_ret=True).split(" ")[-1].replace("\n", "")
-
-        # write extraData to genesis file
-        genesis = self.get_genesis()
-        genesis["extraData"] = extra_data
-        self.set_genesis(genesis)
-
-    def pre_alloc_funds(self, addr, balance):
-        """Pre-allocates funds for a given address."""
-        genesis = self.get_genesis()
-        genesis["alloc"][addr] = {"balance": str(balance)}
-        self.set_genesis(genesis)
+
+        return Keys.istanbul_extra(val_addrs)
 
 class NonValidatorNode(Node):
     """Represents a non-validator node as an object. These nodes share certain properties such as that they need to have at least one account associated with them."""
@@ -1525,36 +3563,52 @@ class NonValidatorNode(Node):
     MANDATORY_KEYS = ["org", "ip", "port", "rpc-port", "docker-ip", "accounts"]
     SETUP_FILES = [os.path.join("genesis.json")]
 
-    def __init__(self, name, type, node_dict, net_dir, docker_geth_port, docker_rpc_port, docker_dir):
+    # seconds to wait for a transaction to be mined
+    RECEIPT_TIMEOUT = 120
+
+    def __init__(self, name, type, node_dict, net_dir, docker_geth_port, docker_rpc_port, docker_dir, state):
         assert type in self.TYPES
-        super().__init__(name, type, node_dict, net_dir, docker_geth_port, docker_rpc_port, docker_dir)
+        super().__init__(name, type, node_dict, net_dir, docker_geth_port, docker_rpc_port, docker_dir, state)
 
-    def setup(self, val_genesis):
-        """Copies genesis block that has been created by a validator to its own directory and sets up nodekey and enode for this node."""
-        shutil.copy(val_genesis, self.dir)
+    def setup(self, genesis=None):
+        """Sets up nodekey and enode for this node and links the network's genesis block to its own directory, if given."""
+        if genesis is not None:
+            genesis.link_to(self.dir)
         self.enode, self.node_addr = self.create_enode()
+        self.save()
 
     def create_enode(self):
         """Creates node's enode and derives address from it to be recognizable later."""
         # create nodekey
         nodekey_path = os.path.join(self.dir, "data", "geth", "nodekey")
-        cmd = f"{self.BOOTNODE_BIN} --genkey {nodekey_path}"
-        Shell.call(cmd, check_ret=True)
+        private_key = Keys.gen_private_key()
+        Keys.write_nodekey(nodekey_path, private_key)
 
         # derive enode from nodekey
-        cmd = f"{self.BOOTNODE_BIN} --nodekey {nodekey_path} --writeaddress"
-        pubkey = Shell.call(cmd, check_ret=True).replace("\n", "")
+        pubkey = Keys.pubkey(private_key)
         enode = self.construct_enode(pubkey, self.docker_ip, self.docker_geth_port)
         addr = self.addr_from_pubkey(pubkey)
 
         return enode, addr
 
+    def connect(self):
+        """Returns the node's shared web3 connection with its main account unlocked."""
+        return self.session().unlocked()
+
+    def wait_for_receipts(self, w3, tx_hashes):
+        """Waits for the receipts of all given transactions. Since they are sent together, this usually takes a single block."""
+        receipts = []
+        for tx_hash in tx_hashes:
+            tx_receipt = w3.eth.waitForTransactionReceipt(tx_hash, timeout=self.RECEIPT_TIMEOUT)
+            if tx_receipt.status == 0:
+                raise TransactionFailedErr(f"Transaction '{tx_hash.hex()}' sent by {self.type} node '{self.name}' failed.")
+            receipts.append(tx_receipt)
+
+        return receipts
+
     def addr_from_pubkey(self, pubkey):
         """Calculates node's address from public key."""
-        cmd = f"{self.ISTANBUL_BIN} address --nodeidhex {pubkey}"
-        addr = Shell.call(cmd, check_ret=True).replace("\n", "")
-
-        return addr
+        return Keys.address(pubkey)
 
     def construct_enode(self, pubkey, ip, port):
         """Creates a enode from given public key and node's ip and port."""
@@ -1562,64 +3616,101 @@ class NonValidatorNode(Node):
 
         return enode
 
-    def up(self, net):
-        """Boots up non-validator node in a docker container with name self.name."""
-        if not self.is_running():
-            uid = os.getuid()
-            cmd = f"docker run -d --rm --user {uid} -w {self.docker_dir} -v {self.dir}:{self.docker_dir} --name {self.name} --ip {self.docker_ip} -p {self.rpc_port}:{self.docker_rpc_port} --network {net.name} {self.type} geth --allow-insecure-unlock --datadir data --nodiscover --syncmode full --verbosity 5 --networkid {net.id} --rpc --rpcaddr 0.0.0.0 --rpcport {self.docker_rpc_port} --rpcapi admin,db,eth,debug,mine,net,shh,txpool,personal,web3,quorum,istanbul --emitcheckpoints --port {self.docker_geth_port}"
-            self.container_id = Shell.call(cmd, check_ret=True).replace("\n", "")[:12]
-            self.save()
-        else:
-            raise NodeAlreadyRunningErr(f"Node '{self.name}' is already running. Please shut all nodes down, before trying to boot up.")
+    def container_spec(self, net):
+        """Returns the spec of the docker container a non-validator node runs in."""
+        cmd = f"geth --allow-insecure-unlock --datadir data --nodiscover --syncmode full --verbosity 5 --networkid {net.id} --rpc --rpcaddr 0.0.0.0 --rpcport {self.docker_rpc_port} --rpcapi admin,db,eth,debug,mine,net,shh,txpool,personal,web3,quorum,istanbul --emitcheckpoints --port {self.docker_geth_port}"
+        return {
+            "name": self.name,
+            "image": self.type,
+            "cmd": cmd.split(),
+            "env": {},
+            "user": os.getuid(),
+            "workdir": self.docker_dir,
+            "binds": {self.dir: self.docker_dir},
+            "ports": {self.docker_rpc_port: self.rpc_port},
+            "network": net.name,
+            "ip": self.docker_ip
+        }
 
 class Maintainer(NonValidatorNode):
     """Represents a maintainer node as an object. Maintainers deploy contracts to the network."""
 
+    # gas of contract deployments and setups, given explicitly since transactions sent together cannot be estimated against contracts that are not mined yet
+    DEPLOY_GAS = 10000000
+    SETUP_GAS = 1000000
+
+    @classmethod
+    def contract_addr(cls, sender, nonce):
+        """Calculates the address of the contract that sender creates with given nonce, which is the end of keccak(rlp([sender, nonce]))."""
+        import rlp
+        from eth_utils import keccak, to_checksum_address
+        return to_checksum_address(keccak(rlp.encode([bytes.fromhex(sender[2:]), nonce]))[12:])
+
+    def next_nonce(self):
+        """Returns the nonce of the main account's next transaction, counting pending ones."""
+        w3 = self.connect()
+        return w3.eth.getTransactionCount(w3.eth.defaultAccount, "pending")
+
+    def setup_contracts(self, setups):
+        """Calls 'setup(address)' on every given (contract, address) pair."""
+        self.deploy_contracts([], setups=setups)
+
+    def deploy_contracts(self, deployments, setups=[], nonce=None):
+        """Deploys every given (contract, constructor args) pair to the blockchain and then calls 'setup(address)' on every given (contract, address) pair. Transactions get explicit consecutive nonces from given nonce on, so that they can be mined into the same block. Contracts whose address was calculated ahead for their nonce are checked against their receipts."""
+        w3 = self.connect()
+        if nonce is None:
+            nonce = w3.eth.getTransactionCount(w3.eth.defaultAccount, "pending")
+
+        tx_hashes = []
+        for contract, args in deployments:
+            eth_contract = w3.eth.contract(abi=contract.get_abi(), bytecode=contract.get_bytecode())
+            tx_hashes.append(eth_contract.constructor(*args).transact({"gas": self.DEPLOY_GAS, "nonce": nonce}))
+            nonce += 1
+        for contract, contract_addr in setups:
+            eth_contract = w3.eth.contract(contract.addr, abi=contract.get_abi())
+            tx_hashes.append(eth_contract.functions.setup(contract_addr).transact({"gas": self.SETUP_GAS, "nonce": nonce}))
+            nonce += 1
+
+        tx_receipts = self.wait_for_receipts(w3, tx_hashes)
+        for (contract, _), tx_receipt in zip(deployments, tx_receipts):
+            if contract.addr is not None and contract.addr != tx_receipt.contractAddress:
+                raise ContractAddressErr(f"Contract '{contract.name}' was deployed to '{tx_receipt.contractAddress}' instead of its calculated address '{contract.addr}'.")
+            contract.addr = tx_receipt.contractAddress
+            contract.save()
+
     def setup_contract(self, contract, contract_addr):
         """Sets up CBDC contract."""
-        if "main" in self.accs.keys():
-            w3 = Web3(Web3.HTTPProvider(f"http://{self.ip}:{self.rpc_port}"))
-            
-            addr = self.accs["main"].addr
-            passphrase = self.accs["main"].passphrase
-            w3.middleware_onion.inject(web3.middleware.geth_poa_middleware, layer=0)
-            w3.geth.personal.unlockAccount(addr, passphrase)
-
-            w3.eth.defaultAccount = addr
-            bytecode = contract.get_bytecode()
-            abi = contract.get_abi()
-            eth_contract = w3.eth.contract(contract.addr, abi=abi, bytecode=bytecode)
-            tx_hash = eth_contract.functions.setup(contract_addr).transact()
-            tx_receipt = w3.eth.waitForTransactionReceipt(tx_hash)
-        else:
-            raise MainAccountErr(f"No geth main account found for maintainer node '{self.name}'.")
+        self.setup_contracts([(contract, contract_addr)])
 
     def deploy_contract(self, contract, *args):
         """Deploys given contract to the blockchain."""
-        # unlock main account, create tx and lock account again
-        if "main" in self.accs.keys():
-            w3 = Web3(Web3.HTTPProvider(f"http://{self.ip}:{self.rpc_port}"))
-            
-            addr = self.accs["main"].addr
-            passphrase = self.accs["main"].passphrase
-            w3.middleware_onion.inject(web3.middleware.geth_poa_middleware, layer=0)
-            w3.geth.personal.unlockAccount(addr, passphrase)
-
-            w3.eth.defaultAccount = addr
-            bytecode = contract.get_bytecode()
-            abi = contract.get_abi()
-            eth_contract = w3.eth.contract(abi=abi, bytecode=bytecode)
-            tx_hash = eth_contract.constructor(*args).transact()
-            tx_receipt = w3.eth.waitForTransactionReceipt(tx_hash)
-
-            contract.addr = tx_receipt.contractAddress
-            contract.save()
-        else:
-            raise MainAccountErr(f"No geth main account found for maintainer node '{self.name}'.")
+        # an address of an earlier deployment is not checked against the new one
+        contract.addr = None
+        self.deploy_contracts([(contract, args)])
 
 class Governor(NonValidatorNode):
     """Represents a governor node as an object. (Necessary Code in Dockerfile)."""
 
+    # 'NodeType' and 'ProposalType' enums of the Governing contract
+    GOVERNED_TYPES = {
+        "governor": 0,
+        "maintainer": 1,
+        "observer": 2,
+        "banker": 3
+    }
+    VOTE_IN = 0
+
+    def make_proposal(self, governing, candidate, as_type):
+        """Proposes to vote a candidate address in as given node type with the Governing contract and returns the id of the proposal."""
+        w3 = self.connect()
+        eth_contract = w3.eth.contract(governing.addr, abi=governing.get_abi())
+        tx_hash = eth_contract.functions.makeProposal(candidate, self.GOVERNED_TYPES[as_type], self.VOTE_IN).transact()
+
+        tx_receipt = self.wait_for_receipts(w3, [tx_hash])[0]
+        events = eth_contract.events.NewProposal().processReceipt(tx_receipt)
+
+        return events[0].args.proposalID
+
 class Banker(NonValidatorNode):
     """Represents a banker node as an object."""
     OPTIONAL_KEYS = ["accounts", "token-supply"]
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import csv
+import time
+import collections
+import http.client
+import urllib.parse
+import argparse
+from getpass import getpass
+from concurrent.futures import ProcessPoolExecutor
+
+PROG = sys.argv[0]
+
+# operations that can be pre-signed: contract, function and the operation's fields passed as its arguments
+OPS = {
+    "mint": ("CBDC", "mint", ["addr", "amount"]),
+    "allocate": ("CBDC", "allocate", ["addr", "amount", "merchcode"]),
+    "transfer": ("CBDC", "transfer", ["addr", "amount"]),
+    "approveMintingRequest": ("CCBDC", "approveMintingRequest", ["req"])
+}
+# operation names of the node command line tools
+ALIASES = {
+    "alloc": "allocate",
+    "approve": "approveMintingRequest"
+}
+
+FORMAT = "presigned-v1"
+GAS = 1000000
+
+# transactions signed per task of the process pool
+CHUNK_SIZE = 256
+
+# broadcast defaults: transactions per second, transactions in flight and seconds to wait for inclusion
+RATE = 200
+WINDOW = 1024
+TIMEOUT = 120
+TICK = 0.1
+
+# geth's errors for a transaction that is in its pool already, which counts as sent, older versions append the hash
+KNOWN_ERRORS = ["already known", "known transaction"]
+
+class RpcErr(Exception):
+    pass
+
+class Rpc(object):
+    """Represents a JSON-RPC connection to a node that is kept alive for all requests."""
+    def __init__(self, url):
+        url = urllib.parse.urlsplit(url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.path = url.path or "/"
+        self.conn = None
+
+    def post(self, payload):
+        """Posts a JSON payload and returns the decoded answer. A connection closed by the node is opened again once."""
+        body = json.dumps(payload).encode("utf-8")
+        for retry in [False, True]:
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=TIMEOUT)
+            try:
+                self.conn.request("POST", self.path, body=body, headers={"Content-Type": "application/json"})
+                return json.loads(self.conn.getresponse().read())
+            except (http.client.HTTPException, ConnectionError):
+                self.conn.close()
+                self.conn = None
+                if retry:
+                    raise
+
+    def call(self, method, *params):
+        """Calls a JSON-RPC method and returns its result."""
+        answer = self.post({"jsonrpc": "2.0", "id": 0, "method": method, "params": list(params)})
+        if "error" in answer:
+            raise RpcErr(f"RPC call '{method}' failed: {answer['error'].get('message')}")
+
+        return answer["result"]
+
+    def batch(self, calls):
+        """Calls many JSON-RPC methods in one request. Returns a (result, error message) pair for each call in order."""
+        if calls == []:
+            return []
+        answers = self.post([{"jsonrpc": "2.0", "id": i, "method": method, "params": list(params)} for i, (method, params) in enumerate(calls)])
+        if isinstance(answers, dict):
+            raise RpcErr(f"RPC batch failed: {answers.get('error', {}).get('message')}")
+
+        answers = {answer["id"]: answer for answer in answers}
+        return [(answers[i].get("result"), answers[i].get("error", {}).get("message")) for i in range(len(calls))]
+
+def is_known(error):
+    """Checks if a send error only says the node knows the transaction already."""
+    return any(error == known or error.startswith(f"{known}:") for known in KNOWN_ERRORS)
+
+def read_ops(path):
+    """Yields the line number and operation of each line of an operations file. CSV files need a header row naming the fields, every other file holds one JSON object per line. Lines that cannot be parsed yield the error instead."""
+    with open(path, newline="") as f:
+        if path.endswith(".csv"):
+            # the header is line 1
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                yield line, row
+        else:
+            for line, row in enumerate(f, start=1):
+                if row.strip() == "":
+                    continue
+                try:
+                    yield line, json.loads(row)
+                except ValueError as err:
+                    yield line, err
+
+def read_contract_info(info_file):
+    """Retrieves addr and ABI from a contract's info file."""
+    try:
+        with open(info_file) as f:
+            contract_dict = json.load(f)
+    except:
+        print(f"Could not read contract's info file '{info_file}'.")
+        sys.exit(1)
+
+    return contract_dict["addr"], contract_dict["get_abi"]
+
+def decrypt_key(keyfile):
+    """Decrypts the private key of a keystore file, returns the key and its address."""
+    from eth_account import Account
+    from web3 import Web3
+
+    try:
+        with open(keyfile) as f:
+            data = json.load(f)
+    except:
+        print(f"Could not read keystore file '{keyfile}'.")
+        sys.exit(1)
+
+    passphrase = getpass()
+    try:
+        private_key = Account.decrypt(data, passphrase)
+        print("Correct.\n")
+    except:
+        print(f"\nCould not decrypt keystore file '{keyfile}' with given password.")
+        sys.exit(1)
+
+    return private_key, Web3.toChecksumAddress(data["address"])
+
+def transaction(contracts, op):
+    """Returns the unsigned transaction of an operation without nonce, its calldata encoded with the contract's ABI."""
+    from web3 import Web3
+
+    name = ALIASES.get(op["op"], op["op"])
+    if name not in OPS:
+        raise ValueError(f"Unknown operation '{op['op']}'.")
+    contract_name, func_name, fields = OPS[name]
+    if contract_name not in contracts:
+        raise ValueError(f"No info file of contract '{contract_name}' given.")
+
+    args = [Web3.toChecksumAddress(op[field]) if field == "addr" else int(op[field]) for field in fields]
+    contract = contracts[contract_name]
+    return {"to": contract.address, "data": contract.encodeABI(fn_name=func_name, args=args), "value": 0}
+
+# private key of a signing process, set once when the process starts
+KEY = None
+
+def init_signer(private_key):
+    global KEY
+    KEY = private_key
+
+def sign_chunk(txs):
+    """Signs transactions with the process' key and returns their raw hex."""
+    from eth_account import Account
+    return [Account.sign_transaction(tx, KEY).rawTransaction.hex() for tx in txs]
+
+def sign(args):
+    """Encodes and signs all operations of a file with sequential nonces into a pre-signed file."""
+    from web3 import Web3
+
+    w3 = Web3()
+    contracts = {}
+    for name, info_file in [("CBDC", args.cbdc), ("CCBDC", args.ccbdc)]:
+        if info_file is not None:
+            addr, abi = read_contract_info(info_file)
+            contracts[name] = w3.eth.contract(Web3.toChecksumAddress(addr), abi=abi)
+    if contracts == {}:
+        print("Give at least one contract info file with '--cbdc' or '--ccbdc'.")
+        sys.exit(1)
+
+    private_key, addr = decrypt_key(args.k)
+
+    # nonce and chain id are only read from a node if not given, so that signing works off the node host
+    nonce, chain_id, gas_price = args.nonce, args.chain_id, args.gas_price
+    if None in [nonce, chain_id]:
+        if args.rpc is None:
+            print("Give '--nonce' and '--chain-id', or '--rpc' to read them from a node.")
+            sys.exit(1)
+        rpc = Rpc(args.rpc)
+        if nonce is None:
+            nonce = int(rpc.call("eth_getTransactionCount", addr, "pending"), 16)
+        if chain_id is None:
+            chain_id = int(rpc.call("eth_chainId"), 16)
+    first_nonce = nonce
+
+    out = args.o or f"{args.f}.signed"
+    skipped = 0
+    chunks = collections.deque()
+    with open(out, "w") as f, ProcessPoolExecutor(max(args.j, 1), initializer=init_signer, initargs=(private_key,)) as pool:
+        f.write(json.dumps({"format": FORMAT, "from": addr, "chainId": chain_id, "nonce": first_nonce}) + "\n")
+
+        def write_first():
+            """Writes the oldest signed chunk, so that the file is in nonce order."""
+            chunk, future = chunks.popleft()
+            for (line, _), raw in zip(chunk, future.result()):
+                f.write(f"{line} {raw}\n")
+
+        def submit(chunk):
+            # chunks are signed in the background while the next ones are encoded, at most two per process
+            chunks.append((chunk, pool.submit(sign_chunk, [tx for _, tx in chunk])))
+            while len(chunks) > 2 * max(args.j, 1):
+                write_first()
+
+        chunk = []
+        for line, op in read_ops(args.f):
+            try:
+                if isinstance(op, Exception):
+                    raise op
+                tx = transaction(contracts, op)
+            except Exception as err:
+                # a skipped operation does not use up a nonce
+                print(f"Skipping line {line}: {err}", file=sys.stderr)
+                skipped += 1
+                continue
+            tx.update({"gas": args.gas, "gasPrice": gas_price, "nonce": nonce, "chainId": chain_id})
+            nonce += 1
+            chunk.append((line, tx))
+            if len(chunk) == CHUNK_SIZE:
+                submit(chunk)
+                chunk = []
+        if chunk != []:
+            submit(chunk)
+        while len(chunks) > 0:
+            write_first()
+
+    print(">", f"{nonce - first_nonce} signed (nonces {first_nonce} to {nonce - 1}), {skipped} skipped, written to '{out}'.")
+
+def broadcast(args):
+    """Sends the transactions of a pre-signed file at a limited rate and writes one result per transaction once it is included."""
+    try:
+        f = open(args.f)
+        header = json.loads(f.readline())
+        if header.get("format") != FORMAT:
+            raise ValueError
+    except (OSError, ValueError):
+        print(f"Could not read pre-signed file '{args.f}'.")
+        sys.exit(1)
+
+    if args.r <= 0:
+        print("The rate has to be positive.")
+        sys.exit(1)
+
+    rpc = Rpc(args.rpc)
+    out = args.o or f"{args.f}.results.jsonl"
+    counts = {"ok": 0, "failed": 0, "error": 0, "timeout": 0, "skipped": 0}
+    pending = {}
+    block = int(rpc.call("eth_blockNumber"), 16)
+
+    with f, open(out, "w") as results:
+        def write(line, status, **fields):
+            counts[status] += 1
+            results.write(json.dumps({"line": line, "status": status, **fields}) + "\n")
+
+        def collect():
+            """Looks up the receipts of pending transactions in new blocks and drops the ones waiting too long."""
+            nonlocal block
+            head = int(rpc.call("eth_blockNumber"), 16)
+            numbers = range(block + 1, head + 1)
+            blocks = rpc.batch([("eth_getBlockByNumber", [hex(number), False]) for number in numbers])
+            included = [(tx_hash, number) for number, (b, _) in zip(numbers, blocks) if b is not None for tx_hash in b["transactions"] if tx_hash in pending]
+            receipts = rpc.batch([("eth_getTransactionReceipt", [tx_hash]) for tx_hash, _ in included])
+            for (tx_hash, number), (receipt, _) in zip(included, receipts):
+                line, _ = pending.pop(tx_hash)
+                status = "ok" if receipt is not None and int(receipt["status"], 16) == 1 else "failed"
+                write(line, status, tx=tx_hash, block=number)
+            block = head
+
+            now = time.monotonic()
+            for tx_hash, (line, sent) in list(pending.items()):
+                if now - sent > args.t:
+                    del pending[tx_hash]
+                    write(line, "timeout", tx=tx_hash)
+            results.flush()
+
+        # every tick sends one batch request, which together make up the rate
+        per_tick = max(1, round(args.r * TICK))
+        tick = per_tick / args.r
+        next_tick = time.monotonic()
+        gap = None
+        txs = ((int(line), raw) for line, raw in (row.split() for row in f if row.strip() != ""))
+        while True:
+            batch = [tx for _, tx in zip(range(per_tick), txs)]
+            if batch == []:
+                break
+            if gap is not None:
+                for line, _ in batch:
+                    write(line, "skipped", error=gap)
+                continue
+
+            while len(pending) > 0 and len(pending) + len(batch) > args.w:
+                collect()
+                time.sleep(TICK)
+            time.sleep(max(next_tick - time.monotonic(), 0))
+            next_tick = max(next_tick + tick, time.monotonic())
+
+            answers = rpc.batch([("eth_sendRawTransaction", [raw]) for _, raw in batch])
+            for (line, raw), (tx_hash, error) in zip(batch, answers):
+                if error is None or is_known(error):
+                    if tx_hash is None:
+                        from eth_utils import keccak
+                        tx_hash = "0x" + keccak(hexstr=raw).hex()
+                    pending[tx_hash] = (line, time.monotonic())
+                elif "nonce too low" in error:
+                    # the transaction or another one with its nonce is included already, e.g. by an earlier broadcast
+                    write(line, "error", error=error)
+                elif gap is None:
+                    # later nonces would wait behind the rejected one forever, they are not sent anymore
+                    write(line, "error", error=error)
+                    gap = f"Not sent, line {line} was rejected: {error}"
+                else:
+                    write(line, "skipped", error=gap)
+            collect()
+
+        while len(pending) > 0:
+            time.sleep(TICK * 10)
+            collect()
+
+    print(">", ", ".join(f"{count} {status}" for status, count in counts.items()) + f", written to '{out}'.")
+
+def arg_parser():
+    """Defines parser for command line input."""
+    parser = argparse.ArgumentParser(prog=PROG, description="Pre-signs contract transactions ahead of time and broadcasts them later.")
+    subparsers = parser.add_subparsers(dest="cmd")
+
+    # sign subcmd
+    sign_parser = subparsers.add_parser("sign", help="Encodes and signs all operations of a file into a pre-signed file.")
+    sign_parser.add_argument("-f", required=True, type=str, help=f"File of operations ({', '.join(list(OPS.keys()) + list(ALIASES.keys()))}), JSONL or '.csv' with a header row, fields 'op', 'addr', 'amount', 'merchcode' and 'req'.", metavar="<file>")
+    sign_parser.add_argument("-k", required=True, type=str, help="Keystore file of the sending account, e.g. from the node's 'data/keystore'.", metavar="<keyfile>")
+    sign_parser.add_argument("-o", type=str, help="Pre-signed file, defaults to '<file>.signed'.", metavar="<file>")
+    sign_parser.add_argument("-j", type=int, default=os.cpu_count() or 1, help="Signing processes, defaults to the count of CPUs.", metavar="<jobs>")
+    sign_parser.add_argument("--cbdc", type=str, help="Path to 'CBDC-contract.info'.", metavar="/path/to/CBDC.info")
+    sign_parser.add_argument("--ccbdc", type=str, help="Path to 'CCBDC-contract.info'.", metavar="/path/to/CCBDC.info")
+    sign_parser.add_argument("--nonce", type=int, help="Nonce of the first transaction.", metavar="<nonce>")
+    sign_parser.add_argument("--chain-id", type=int, help="Chain id to sign for.", metavar="<chain-id>")
+    sign_parser.add_argument("--rpc", type=str, help="RPC url of a node to read nonce and chain id from, if not given.", metavar="<url>")
+    sign_parser.add_argument("--gas", type=int, default=GAS, help=f"Gas per transaction, defaults to {GAS}.", metavar="<gas>")
+    sign_parser.add_argument("--gas-price", type=int, default=0, help="Gas price, defaults to 0.", metavar="<gas-price>")
+
+    # broadcast subcmd
+    broadcast_parser = subparsers.add_parser("broadcast", help="Sends a pre-signed file to a node and tracks the transactions' inclusion.")
+    broadcast_parser.add_argument("-f", required=True, type=str, help="Pre-signed file.", metavar="<file>")
+    broadcast_parser.add_argument("--rpc", required=True, type=str, help="RPC url of the node, e.g. 'http://localhost:8000'.", metavar="<url>")
+    broadcast_parser.add_argument("-o", type=str, help="Result file, defaults to '<file>.results.jsonl'.", metavar="<file>")
+    broadcast_parser.add_argument("-r", type=float, default=RATE, help=f"Transactions sent per second, defaults to {RATE}.", metavar="<rate>")
+    broadcast_parser.add_argument("-w", type=int, default=WINDOW, help=f"Transactions in flight at once, defaults to {WINDOW}.", metavar="<window>")
+    broadcast_parser.add_argument("-t", type=int, default=TIMEOUT, help=f"Seconds to wait for a transaction's inclusion, defaults to {TIMEOUT}.", metavar="<timeout>")
+
+    return parser
+
+def main():
+    args = arg_parser().parse_args()
+
+    if args.cmd == "sign":
+        sign(args)
+    elif args.cmd == "broadcast":
+        broadcast(args)
+    else:
+        arg_parser().print_help()
+
+if __name__ == "__main__":
+    main()